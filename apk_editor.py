@@ -1,32 +1,137 @@
 import os
+import sys
 import shutil
+import tempfile
 import json
+import hashlib
 import logging
+import mmap
+import threading
 import zipfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from utils.apktool import APKTool
 from utils.file_manager import FileManager
-from werkzeug.utils import secure_filename
+from utils.fastcopy import fast_copy
+from utils.linux_statx import fast_size, fast_exists, entry_size
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Image file extensions listed as editable drawables
+_IMG_EXTS = frozenset({'.png', '.jpg', '.jpeg', '.webp', '.gif'})
+
+# Text resources above this size are decoded straight from a read-only mapping
+_MMAP_THRESHOLD = 1 << 20
+
+# Number of decoded text resources kept in the content LRU
+_CONTENT_CACHE_SIZE = 32
+
+# Number of decoded APK trees kept in temp/decompile_cache
+_DECOMPILE_CACHE_ENTRIES = 8
+
+# Drawable folder count from which get_project_resources lists them on the I/O pool
+_PARALLEL_DRAWABLE_DIRS = 4
+
+# Buffer size for streaming image uploads to disk
+_STREAM_CHUNK = 1 << 20
+
+# Flags for raw resource writes; O_BINARY only exists (and matters) on Windows
+_WRITE_FLAGS = (os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+                | getattr(os, 'O_CLOEXEC', 0) | getattr(os, 'O_BINARY', 0))
+
+
+def _dumps_json(data):
+    """Serialize to compact JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+def _list_drawable_dir(decompiled_dir, drawable_dir):
+    """List image resources in one drawable folder"""
+    images = []
+    try:
+        with os.scandir(os.path.join(decompiled_dir, drawable_dir)) as entries:
+            for entry in entries:
+                name = entry.name
+                if name[name.rfind('.'):].lower() in _IMG_EXTS and entry.is_file(follow_symlinks=False):
+                    images.append({
+                        'name': name,
+                        'path': f"{drawable_dir}/{name}",
+                        'folder': drawable_dir,
+                        'size': entry_size(entry)
+                    })
+    except FileNotFoundError:
+        pass
+    return images
+
 
 class APKEditor:
+    __slots__ = ('projects_folder', 'temp_folder', 'apktool', 'file_manager', '_drawable_dirs_cache',
+                 '_content_cache', '_project_dirs', '_dirs_created', '_io_pool',
+                 '_cache_lock')
+
     def __init__(self, projects_folder, temp_folder):
         self.projects_folder = projects_folder
         self.temp_folder = temp_folder
         self.apktool = APKTool()
         self.file_manager = FileManager(projects_folder)
+        self._drawable_dirs_cache = {}
+        self._content_cache = OrderedDict()
+        self._project_dirs = {}
+        self._dirs_created = set()
+        self._io_pool = ThreadPoolExecutor(max_workers=2)
+        # Request handlers run on several threads; guards the content LRU and _dirs_created
+        self._cache_lock = threading.Lock()
+
+    def _dirs(self, project_id):
+        """Return (project_dir, decompiled_dir), joining the paths once per project"""
+        dirs = self._project_dirs.get(project_id)
+        if dirs is None:
+            project_dir = sys.intern(os.path.join(self.projects_folder, project_id))
+            dirs = (project_dir, sys.intern(os.path.join(project_dir, 'decompiled')))
+            self._project_dirs[project_id] = dirs
+        return dirs
+
+    def _ensure_dir(self, directory):
+        """Create directory once; later calls for the same path skip makedirs"""
+        if directory not in self._dirs_created:
+            os.makedirs(directory, exist_ok=True)
+            with self._cache_lock:
+                self._dirs_created.add(directory)
+
+    def _forget_tree(self, decompiled_dir):
+        """Drop created-directory and content cache entries under a decompiled tree"""
+        with self._cache_lock:
+            self._dirs_created.difference_update(
+                [d for d in self._dirs_created if d.startswith(decompiled_dir)]
+            )
+            for key in [k for k in self._content_cache if k[0].startswith(decompiled_dir)]:
+                del self._content_cache[key]
 
     def decompile_apk(self, apk_path, project_id, project_name):
         """Decompile APK and create project"""
         try:
             # Create project directory
-            project_dir = os.path.join(self.projects_folder, project_id)
+            project_dir, decompiled_dir = self._dirs(project_id)
             os.makedirs(project_dir, exist_ok=True)
 
-            # Decompile APK
-            decompiled_dir = os.path.join(project_dir, 'decompiled')
-            success = self.apktool.decompile(apk_path, decompiled_dir)
+            # Forget directories and content cached for a previous tree of this project
+            self._forget_tree(decompiled_dir)
+
+            # Decompile APK (or reuse the output for an APK seen before)
+            success, apk_digest = self._decompile_cached(apk_path, project_id, decompiled_dir)
 
             if success:
+                # Copy original APK to project in the background
+                copy_future = self._io_pool.submit(
+                    fast_copy, apk_path, os.path.join(project_dir, 'original.apk'), allow_link=True
+                )
+
                 # Create project metadata
                 metadata = {
                     'id': project_id,
@@ -36,17 +141,22 @@ class APKEditor:
                     'status': 'decompiled',
                     'resources_available': True
                 }
+                if apk_digest:
+                    # Keeps the decompile cache entry alive while this project exists
+                    metadata['apk_sha256'] = apk_digest
 
-                # Save metadata
+                # Save metadata atomically so a crash never leaves it half-written
                 metadata_path = os.path.join(project_dir, 'metadata.json')
-                with open(metadata_path, 'w') as f:
-                    json.dump(metadata, f, indent=2)
-
-                # Copy original APK to project
-                shutil.copy2(apk_path, os.path.join(project_dir, 'original.apk'))
+                with open(metadata_path + '.tmp', 'wb') as f:
+                    f.write(_dumps_json(metadata))
+                os.replace(metadata_path + '.tmp', metadata_path)
 
                 # Ensure essential Android structure exists
                 self._ensure_android_structure(decompiled_dir)
+                self._prune_decompile_cache()
+
+                # Wait for the APK copy to land before reporting success
+                copy_future.result()
 
                 logging.info(f"APK decompiled successfully: {project_id}")
                 return True
@@ -60,6 +170,101 @@ class APKEditor:
             logging.error(f"Decompile error: {str(e)}")
             return False
 
+    def _decompile_cached(self, apk_path, project_id, decompiled_dir):
+        """Decompile through a cache of apktool output keyed by the APK's SHA-256
+
+        Returns (success, digest); digest is None when the tree is not backed by the cache.
+        """
+        if os.path.exists(decompiled_dir):
+            shutil.rmtree(decompiled_dir)
+
+        digest = None
+        try:
+            with open(apk_path, 'rb') as f:
+                digest = hashlib.file_digest(f, 'sha256').hexdigest()
+            cache_dir = os.path.join(self.temp_folder, 'decompile_cache', digest)
+
+            if os.path.isdir(cache_dir):
+                logging.info(f"Reusing cached decompile output: {digest}")
+                # The cache is evicted least recently used first, by mtime
+                os.utime(cache_dir)
+                # Projects get their own copy since resources are edited in place
+                shutil.copytree(cache_dir, decompiled_dir, copy_function=fast_copy)
+                return True, digest
+
+        except Exception as e:
+            logging.warning(f"Decompile cache unavailable, decompiling directly: {str(e)}")
+            digest = None
+            shutil.rmtree(decompiled_dir, ignore_errors=True)
+
+        success, simulated = self.apktool.decompile_detailed(apk_path, decompiled_dir)
+        # Simulated output is only a stand-in for a real decode, so it is never cached
+        if not success or simulated or digest is None:
+            return success, None
+
+        self._populate_decompile_cache(decompiled_dir, cache_dir, project_id)
+        return True, digest
+
+    def _populate_decompile_cache(self, decompiled_dir, cache_dir, project_id):
+        """Copy a fresh apktool tree into the decompile cache"""
+        # Copy into a private directory, then publish it in one rename
+        tmp_dir = f"{cache_dir}.{project_id}.tmp"
+        try:
+            if os.path.exists(tmp_dir):
+                shutil.rmtree(tmp_dir)
+            shutil.copytree(decompiled_dir, tmp_dir, copy_function=fast_copy)
+            os.replace(tmp_dir, cache_dir)
+        except OSError as e:
+            # Another upload of the same APK published it first, or the disk is full
+            logging.warning(f"Could not cache decompile output: {str(e)}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _prune_decompile_cache(self):
+        """Drop cache entries no project references, and the oldest beyond the size limit"""
+        cache_root = os.path.join(self.temp_folder, 'decompile_cache')
+        try:
+            referenced = set()
+            with os.scandir(self.projects_folder) as projects:
+                for project in projects:
+                    try:
+                        with open(os.path.join(project.path, 'metadata.json'), 'rb') as f:
+                            digest = json.loads(f.read()).get('apk_sha256')
+                    except (OSError, ValueError, AttributeError):
+                        continue
+                    if digest:
+                        referenced.add(digest)
+
+            with os.scandir(cache_root) as it:
+                # Directories still being populated carry a '.tmp' suffix and are left alone
+                cached = [(entry.stat().st_mtime, entry.name, entry.path) for entry in it
+                          if '.' not in entry.name and entry.is_dir(follow_symlinks=False)]
+
+            cached.sort(reverse=True)
+            kept = 0
+            for _, name, path in cached:
+                if name in referenced and kept < _DECOMPILE_CACHE_ENTRIES:
+                    kept += 1
+                    continue
+                shutil.rmtree(path, ignore_errors=True)
+                logging.info(f"Evicted cached decompile output: {name}")
+
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.warning(f"Could not prune decompile cache: {str(e)}")
+
+    def delete_project(self, project_id):
+        """Delete project and the decompile cache entries only it referenced"""
+        deleted = self.file_manager.delete_project(project_id)
+        if deleted:
+            _, decompiled_dir = self._dirs(project_id)
+            self._forget_tree(decompiled_dir)
+            with self._cache_lock:
+                self._project_dirs.pop(project_id, None)
+            self._drawable_dirs_cache.pop(project_id, None)
+            self._prune_decompile_cache()
+        return deleted
+
     def _ensure_android_structure(self, decompiled_dir):
         """Ensure proper Android project structure"""
         try:
@@ -75,9 +280,9 @@ class APKEditor:
                 'assets'
             ]
 
+            # Built like the save paths so later saves into these folders skip makedirs
             for dir_path in essential_dirs:
-                full_path = os.path.join(decompiled_dir, dir_path)
-                os.makedirs(full_path, exist_ok=True)
+                self._ensure_dir(f"{decompiled_dir}/{dir_path}")
 
             # Ensure AndroidManifest.xml exists
             manifest_path = os.path.join(decompiled_dir, 'AndroidManifest.xml')
@@ -212,8 +417,7 @@ class APKEditor:
 
     def get_project_resources(self, project_id):
         """Get available resources for editing"""
-        project_dir = os.path.join(self.projects_folder, project_id)
-        decompiled_dir = os.path.join(project_dir, 'decompiled')
+        _, decompiled_dir = self._dirs(project_id)
 
         resources = {
             'images': [],
@@ -223,54 +427,44 @@ class APKEditor:
 
         try:
             # Get drawable resources (images)
-            drawable_dirs = [
-                'res/drawable',
-                'res/drawable-hdpi',
-                'res/drawable-mdpi', 
-                'res/drawable-xhdpi',
-                'res/drawable-xxhdpi',
-                'res/drawable-xxxhdpi'
-            ]
-
-            for drawable_dir in drawable_dirs:
-                dir_path = os.path.join(decompiled_dir, drawable_dir)
-                if os.path.exists(dir_path):
-                    for filename in os.listdir(dir_path):
-                        if filename.lower().endswith(('.png', '.jpg', '.jpeg', '.webp', '.gif')):
-                            resources['images'].append({
-                                'name': filename,
-                                'path': os.path.join(drawable_dir, filename),
-                                'folder': drawable_dir
-                            })
-
-            # Get string resources
-            strings_path = os.path.join(decompiled_dir, 'res/values/strings.xml')
-            if os.path.exists(strings_path):
-                resources['strings'].append({
-                    'name': 'strings.xml',
-                    'path': 'res/values/strings.xml',
-                    'type': 'strings'
-                })
+            drawable_dirs = self._get_drawable_dirs(project_id, decompiled_dir)
 
-            # Get colors
-            colors_path = os.path.join(decompiled_dir, 'res/values/colors.xml')
-            if os.path.exists(colors_path):
+            # Scan many drawable folders on the shared I/O pool; map keeps the folder order.
+            # For a handful the handoff costs more than the scandirs themselves
+            if len(drawable_dirs) >= _PARALLEL_DRAWABLE_DIRS:
+                listings = list(self._io_pool.map(_list_drawable_dir, [decompiled_dir] * len(drawable_dirs), drawable_dirs))
+            else:
+                listings = [_list_drawable_dir(decompiled_dir, d) for d in drawable_dirs]
+            for images in listings:
+                resources['images'].extend(images)
+
+            # Get string resources and colors
+            for values_name, values_type in (('strings.xml', 'strings'), ('colors.xml', 'colors')):
+                try:
+                    values_size = fast_size(f"{decompiled_dir}/res/values/{values_name}")
+                except FileNotFoundError:
+                    continue
                 resources['strings'].append({
-                    'name': 'colors.xml',
-                    'path': 'res/values/colors.xml',
-                    'type': 'colors'
+                    'name': values_name,
+                    'path': f"res/values/{values_name}",
+                    'type': values_type,
+                    'size': values_size
                 })
 
             # Get layout resources
             layout_dir = os.path.join(decompiled_dir, 'res/layout')
-            if os.path.exists(layout_dir):
-                for filename in os.listdir(layout_dir):
-                    if filename.endswith('.xml'):
-                        resources['layouts'].append({
-                            'name': filename,
-                            'path': os.path.join('res/layout', filename),
-                            'type': 'layout'
-                        })
+            try:
+                with os.scandir(layout_dir) as entries:
+                    for entry in entries:
+                        if entry.name.endswith('.xml') and entry.is_file(follow_symlinks=False):
+                            resources['layouts'].append({
+                                'name': entry.name,
+                                'path': f"res/layout/{entry.name}",
+                                'type': 'layout',
+                                'size': entry_size(entry)
+                            })
+            except FileNotFoundError:
+                pass
 
             return resources
 
@@ -278,22 +472,66 @@ class APKEditor:
             logging.error(f"Error getting resources: {str(e)}")
             return resources
 
+    def _get_drawable_dirs(self, project_id, decompiled_dir):
+        """Discover drawable directories with a single scan of res/"""
+        res_dir = os.path.join(decompiled_dir, 'res')
+        try:
+            res_mtime = os.stat(res_dir).st_mtime_ns
+        except FileNotFoundError:
+            return []
+
+        cached = self._drawable_dirs_cache.get(project_id)
+        if cached and cached[0] == res_mtime:
+            return cached[1]
+
+        with os.scandir(res_dir) as entries:
+            drawable_dirs = sorted(
+                f"res/{entry.name}" for entry in entries
+                if entry.name.startswith('drawable') and entry.is_dir()
+            )
+
+        self._drawable_dirs_cache[project_id] = (res_mtime, drawable_dirs)
+        return drawable_dirs
+
     def get_resource_content(self, project_id, resource_type, resource_path):
         """Get content of a specific resource"""
         try:
-            project_dir = os.path.join(self.projects_folder, project_id)
-            decompiled_dir = os.path.join(project_dir, 'decompiled')
-            file_path = os.path.join(decompiled_dir, resource_path)
-
-            if os.path.exists(file_path):
-                if resource_type in ['string', 'layout']:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        return f.read()
-                else:
-                    return {'exists': True, 'path': file_path}
+            _, decompiled_dir = self._dirs(project_id)
+            file_path = f"{decompiled_dir}/{resource_path}"
+
+            if resource_type in ['string', 'layout']:
+                # Serve unchanged files from the LRU without opening them
+                key = (file_path, os.stat(file_path).st_mtime_ns)
+                with self._cache_lock:
+                    content = self._content_cache.get(key)
+                    if content is not None:
+                        self._content_cache.move_to_end(key)
+                if content is not None:
+                    return content
+
+                with open(file_path, 'rb') as f:
+                    size = os.fstat(f.fileno()).st_size
+                    if size > _MMAP_THRESHOLD:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            content = str(mm, 'utf-8')
+                    else:
+                        content = (f.read(size) if size else f.read()).decode('utf-8')
+                # Match text-mode universal newline handling
+                if '\r' in content:
+                    content = content.replace('\r\n', '\n').replace('\r', '\n')
+
+                with self._cache_lock:
+                    self._content_cache[key] = content
+                    if len(self._content_cache) > _CONTENT_CACHE_SIZE:
+                        self._content_cache.popitem(last=False)
+                return content
+            elif os.path.exists(file_path):
+                return {'exists': True, 'path': file_path}
             else:
                 return ""
 
+        except FileNotFoundError:
+            return ""
         except Exception as e:
             logging.error(f"Error getting resource content: {str(e)}")
             return ""
@@ -301,15 +539,18 @@ class APKEditor:
     def save_image_resource(self, project_id, resource_path, file):
         """Save image resource"""
         try:
-            project_dir = os.path.join(self.projects_folder, project_id)
-            decompiled_dir = os.path.join(project_dir, 'decompiled')
-            file_path = os.path.join(decompiled_dir, resource_path)
+            _, decompiled_dir = self._dirs(project_id)
+            file_path = f"{decompiled_dir}/{resource_path}"
 
             # Ensure directory exists
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            self._ensure_dir(os.path.dirname(file_path))
 
-            # Save file
-            file.save(file_path)
+            # Save file, streaming the upload ourselves when it exposes a stream
+            stream = getattr(file, 'stream', None)
+            if stream is None:
+                file.save(file_path)
+            else:
+                self._write_stream(file_path, stream, getattr(file, 'content_length', 0) or 0)
             logging.info(f"Image resource saved: {resource_path}")
             return True
 
@@ -317,67 +558,94 @@ class APKEditor:
             logging.error(f"Error saving image resource: {str(e)}")
             return False
 
+    def _write_stream(self, file_path, stream, size):
+        """Copy an upload stream to disk in 1 MiB chunks, preallocating when the size is known"""
+        fd = os.open(file_path, _WRITE_FLAGS, 0o644)
+        with open(fd, 'wb', closefd=True) as out:
+            preallocated = False
+            if size and hasattr(os, 'posix_fallocate'):
+                try:
+                    os.posix_fallocate(fd, 0, size)
+                    preallocated = True
+                except OSError:
+                    pass
+            shutil.copyfileobj(stream, out, _STREAM_CHUNK)
+            if preallocated:
+                # Drop any preallocated tail the upload did not fill
+                out.truncate()
+
     def save_string_resource(self, project_id, resource_path, content):
         """Save string resource"""
-        try:
-            project_dir = os.path.join(self.projects_folder, project_id)
-            decompiled_dir = os.path.join(project_dir, 'decompiled')
-            file_path = os.path.join(decompiled_dir, resource_path)
-
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-            # Save content
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-
-            logging.info(f"String resource saved: {resource_path}")
-            return True
-
-        except Exception as e:
-            logging.error(f"Error saving string resource: {str(e)}")
-            return False
+        return self._save_text_resource(project_id, resource_path, content, 'string')
 
     def save_layout_resource(self, project_id, resource_path, content):
         """Save layout resource"""
-        try:
-            project_dir = os.path.join(self.projects_folder, project_id)
-            decompiled_dir = os.path.join(project_dir, 'decompiled')
-            file_path = os.path.join(decompiled_dir, resource_path)
+        return self._save_text_resource(project_id, resource_path, content, 'layout')
 
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    def _forget_content(self, file_path):
+        """Drop cached content for a file that has just been rewritten"""
+        with self._cache_lock:
+            for key in [k for k in self._content_cache if k[0] == file_path]:
+                del self._content_cache[key]
 
-            # Save content
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+    def _save_text_resource(self, project_id, resource_path, content, kind):
+        """Atomically write a text resource (write to temp file, then rename)"""
+        try:
+            _, decompiled_dir = self._dirs(project_id)
+            file_path = f"{decompiled_dir}/{resource_path}"
 
-            logging.info(f"Layout resource saved: {resource_path}")
+            # Ensure directory exists
+            self._ensure_dir(os.path.dirname(file_path))
+
+            # Save content with a raw descriptor and as few write calls as possible, into a
+            # uniquely named temp file so concurrent saves of one resource never share it
+            data = memoryview(content.encode('utf-8'))
+            fd, tmp_path = tempfile.mkstemp(suffix='.tmp', prefix='.save-', dir=os.path.dirname(file_path))
+            try:
+                try:
+                    if hasattr(os, 'fchmod'):
+                        os.fchmod(fd, 0o644)
+                    while data:
+                        data = data[os.write(fd, data):]
+                finally:
+                    os.close(fd)
+                os.replace(tmp_path, file_path)
+            except BaseException:
+                # Never leave a stray file in res/; apktool rejects it on the next build
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+
+            self._forget_content(file_path)
+            logging.info(f"{kind.capitalize()} resource saved: {resource_path}")
             return True
 
         except Exception as e:
-            logging.error(f"Error saving layout resource: {str(e)}")
+            logging.error(f"Error saving {kind} resource: {str(e)}")
             return False
 
 
     def compile_apk(self, project_id):
         """Compile modified APK"""
         try:
-            project_dir = os.path.join(self.projects_folder, project_id)
-            decompiled_dir = os.path.join(project_dir, 'decompiled')
+            project_dir, decompiled_dir = self._dirs(project_id)
             output_path = os.path.join(project_dir, 'compiled.apk')
 
             # Compile APK
             success = self.apktool.compile(decompiled_dir, output_path)
 
-            if success and os.path.exists(output_path):
+            if success and fast_exists(output_path):
+                # Start signing immediately and validate the structure alongside it
+                signed_path = os.path.join(project_dir, 'signed.apk')
+                sign_future = self._io_pool.submit(self.apktool.sign_apk, output_path, signed_path)
+
                 # Validate APK structure
                 if self._validate_apk_structure(output_path):
-                    # Sign APK
-                    signed_path = os.path.join(project_dir, 'signed.apk')
-                    sign_success = self.apktool.sign_apk(output_path, signed_path)
+                    sign_success = sign_future.result()
 
-                    if sign_success and os.path.exists(signed_path):
+                    if sign_success and fast_exists(signed_path):
                         # Final validation of signed APK
                         if self._validate_signed_apk(signed_path):
                             logging.info(f"APK compiled and signed successfully: {project_id}")
@@ -389,6 +657,10 @@ class APKEditor:
                         logging.warning(f"APK compiled but signing failed: {project_id}")
                         return output_path
                 else:
+                    # Discard the speculatively signed APK
+                    sign_future.result()
+                    if os.path.exists(signed_path):
+                        os.remove(signed_path)
                     logging.error(f"APK structure validation failed: {project_id}")
                     return None
             else:
@@ -403,17 +675,24 @@ class APKEditor:
         """Validate APK has required structure for Android"""
         try:
             with zipfile.ZipFile(apk_path, 'r') as apk_zip:
-                filenames = apk_zip.namelist()
+                # One pass over the central directory, stopping once both are found
+                has_manifest = False
+                has_dex = False
+                for info in apk_zip.infolist():
+                    name = info.filename
+                    if name == 'AndroidManifest.xml':
+                        has_manifest = True
+                    elif name.endswith('.dex'):
+                        has_dex = True
+                    if has_manifest and has_dex:
+                        break
 
                 # Check for required files
-                required_files = ['AndroidManifest.xml']
-                for required_file in required_files:
-                    if required_file not in filenames:
-                        logging.error(f"Missing required file: {required_file}")
-                        return False
+                if not has_manifest:
+                    logging.error("Missing required file: AndroidManifest.xml")
+                    return False
 
                 # Check for classes.dex or similar
-                has_dex = any(f.endswith('.dex') for f in filenames)
                 if not has_dex:
                     logging.warning("No DEX files found - APK may not be installable")
 
@@ -428,11 +707,14 @@ class APKEditor:
         """Validate signed APK has proper signature files"""
         try:
             with zipfile.ZipFile(apk_path, 'r') as apk_zip:
-                filenames = apk_zip.namelist()
-
                 # Check for signature files
                 signature_files = ['META-INF/MANIFEST.MF', 'META-INF/CERT.SF', 'META-INF/CERT.RSA']
-                missing_sig_files = [f for f in signature_files if f not in filenames]
+                missing_sig_files = []
+                for sig_file in signature_files:
+                    try:
+                        apk_zip.getinfo(sig_file)
+                    except KeyError:
+                        missing_sig_files.append(sig_file)
 
                 if missing_sig_files:
                     logging.warning(f"Missing signature files: {missing_sig_files}")
@@ -447,17 +729,20 @@ class APKEditor:
 
     def get_compiled_apk_path(self, project_id):
         """Get path to compiled APK"""
-        project_dir = os.path.join(self.projects_folder, project_id)
+        project_dir, _ = self._dirs(project_id)
 
-        # Check for signed APK first
-        signed_path = os.path.join(project_dir, 'signed.apk')
-        if os.path.exists(signed_path):
-            return signed_path
+        # One directory scan answers both lookups
+        try:
+            with os.scandir(project_dir) as entries:
+                names = {entry.name for entry in entries if entry.name in ('signed.apk', 'compiled.apk')}
+        except FileNotFoundError:
+            return None
 
-        # Fall back to compiled APK
-        compiled_path = os.path.join(project_dir, 'compiled.apk')
-        if os.path.exists(compiled_path):
-            return compiled_path
+        # Check for signed APK first, then fall back to compiled APK
+        if 'signed.apk' in names:
+            return os.path.join(project_dir, 'signed.apk')
+        if 'compiled.apk' in names:
+            return os.path.join(project_dir, 'compiled.apk')
 
         return None
 
@@ -472,7 +757,7 @@ class APKEditor:
     def force_save_project(self, project_id):
         """Force save all project changes to ensure persistence"""
         try:
-            project_dir = os.path.join(self.projects_folder, project_id)
+            project_dir, _ = self._dirs(project_id)
             if os.path.exists(project_dir):
                 # Force sync all files in project directory
                 for root, dirs, files in os.walk(project_dir):
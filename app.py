@@ -34,6 +34,8 @@ except ImportError as e:
             return None
         def sign_apk_advanced(self, *args, **kwargs):
             return False
+        def delete_project(self, *args, **kwargs):
+            return False
 
 try:
     from utils.file_manager import FileManager
@@ -126,7 +128,6 @@ def upload_apk():
             flash('File too large. Maximum size is 100MB.', 'error')
             return redirect(url_for('index'))
 
-    try:
         # Generate unique project ID
         project_id = str(uuid.uuid4())
         filename = secure_filename(file.filename)
@@ -303,7 +304,7 @@ def download_apk(project_id):
 def delete_project(project_id):
     """Delete project"""
     try:
-        success = file_manager.delete_project(project_id)
+        success = apk_editor.delete_project(project_id)
         if success:
             flash('Project deleted successfully!', 'success')
         else:
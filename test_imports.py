@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Module Import Test
+Regression check that the application modules parse and import
+"""
+
+import os
+import sys
+import importlib
+import py_compile
+import tempfile
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ['app', 'apk_editor', 'utils.apktool']
+
+
+def test_compile_modules():
+    """Test that every module compiles (catches syntax errors without dependencies)"""
+    print("Compiling Modules...")
+    print("-" * 50)
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    for module in MODULES:
+        path = os.path.join(base_dir, *module.split('.')) + '.py'
+        py_compile.compile(path, doraise=True)
+        print(f"{module}: ✓ Compiles")
+
+
+def test_import_modules():
+    """Test that every module imports"""
+    print("\nImporting Modules...")
+    print("-" * 50)
+
+    # app creates its upload/project/temp folders relative to the working directory
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.chdir(work_dir)
+        try:
+            for module in MODULES:
+                importlib.import_module(module)
+                print(f"{module}: ✓ Imports")
+        finally:
+            os.chdir(cwd)
+
+
+def main():
+    """Main test function"""
+    print("APK Editor Import Test")
+    print("=" * 50)
+
+    try:
+        test_compile_modules()
+        test_import_modules()
+    except Exception as e:
+        print(f"\n❌ Import test FAILED: {e}")
+        return False
+
+    print("\n🎉 Import test PASSED!")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Signed APK Round-Trip Test
+Signs a sample APK and checks the result with zipfile.testzip()
+"""
+
+import os
+import sys
+import zipfile
+import tempfile
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import utils.apktool as apktool_module
+from utils.apktool import APKTool
+
+
+def create_sample_apk(apk_path):
+    """Create an APK mixing stored, deflated, small and streamed (over 1 MiB) entries"""
+    entries = {
+        'AndroidManifest.xml': b'<manifest package="com.test.roundtrip"/>' * 10,
+        'classes.dex': b'dex\n035\x00' + bytes(range(256)) * 64,
+        'resources.arsc': bytes(4096),
+        'res/drawable-hdpi/icon.png': os.urandom(3000),
+        'res/layout/main.xml': b'<LinearLayout/>' * 40,
+        'assets/large.bin': os.urandom(1 << 16) * 24,
+        'assets/large.ogg': os.urandom(3 << 20),
+        'META-INF/OLD.SF': b'stale signature',
+    }
+    with zipfile.ZipFile(apk_path, 'w', zipfile.ZIP_DEFLATED) as apk_zip:
+        for name, data in entries.items():
+            compress_type = zipfile.ZIP_STORED if name.endswith(('.png', '.arsc', '.ogg')) else zipfile.ZIP_DEFLATED
+            apk_zip.writestr(name, data, compress_type=compress_type)
+    return entries
+
+
+def check_signed_apk(signed_path, entries):
+    """Check the signed APK is intact and carries every original entry unchanged"""
+    with zipfile.ZipFile(signed_path) as signed_zip:
+        bad_entry = signed_zip.testzip()
+        if bad_entry is not None:
+            raise AssertionError(f"Corrupt entry in signed APK: {bad_entry}")
+        names = set(signed_zip.namelist())
+        for name in ('META-INF/MANIFEST.MF', 'META-INF/CERT.SF', 'META-INF/CERT.RSA'):
+            if name not in names:
+                raise AssertionError(f"Missing {name}")
+        if 'META-INF/OLD.SF' in names:
+            raise AssertionError("Old signature file was copied")
+        for name, data in entries.items():
+            if not name.startswith('META-INF/') and signed_zip.read(name) != data:
+                raise AssertionError(f"Content changed for {name}")
+
+
+def test_sign_round_trip(raw_append=True):
+    """Sign a sample APK and validate it, with or without raw entry copies"""
+    label = 'raw copies' if raw_append else 'writestr fallback'
+    original = apktool_module._supports_raw_append
+    if not raw_append:
+        apktool_module._supports_raw_append = lambda zf: False
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            apk_path = os.path.join(work_dir, 'input.apk')
+            signed_path = os.path.join(work_dir, 'signed.apk')
+            entries = create_sample_apk(apk_path)
+            if not APKTool().sign_apk(apk_path, signed_path):
+                raise AssertionError("sign_apk reported failure")
+            check_signed_apk(signed_path, entries)
+        print(f"Sign round trip ({label}): ✓ testzip clean")
+    finally:
+        apktool_module._supports_raw_append = original
+
+
+def main():
+    """Main test function"""
+    print("Signed APK Round-Trip Test")
+    print("=" * 50)
+
+    try:
+        test_sign_round_trip(raw_append=True)
+        test_sign_round_trip(raw_append=False)
+    except Exception as e:
+        print(f"\n❌ Signed APK test FAILED: {e}")
+        return False
+
+    print("\n🎉 Signed APK test PASSED!")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -1,31 +1,244 @@
 
 import os
+import re
 import subprocess
 import logging
 import zipfile
 import shutil
 import hashlib
-import base64
+import struct
+import threading
 import time
+import zlib
+from binascii import b2a_base64
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+try:
+    import deflate
+except ImportError:
+    deflate = None
+
+def _sha256_digest(data):
+    """SHA-256 digest of an entry; run on worker threads since hashlib releases the GIL"""
+    return hashlib.sha256(data).digest()
+
+# Entries that gain nothing from deflate (or, like resources.arsc, must be stored)
+_STORE_EXTS = frozenset({'.png', '.jpg', '.jpeg', '.webp', '.gif', '.ogg', '.mp3', '.mp4', '.arsc'})
+
+# PKCS#7-shaped CERT.RSA blob for timestamp 0: ContentInfo SEQUENCE, SignedData OID,
+# context tag, then 3072 bytes of SignedData (version, digest algorithms, content info,
+# pseudo certificate data at 50-1000, pseudo RSA signature at 1500-2012 and a
+# simplified X.509 header at 2000-2010)
+_CERT_RSA_SIGNED_DATA = (
+    bytes.fromhex('020101' '310b300906052b0e03021a05' '300b06092a864886f70d0107010500')
+    + bytes(20)
+    + bytes((i + 127) % 256 for i in range(50, 1000))
+    + bytes(500)
+    + bytes((i * 7) % 256 for i in range(1500, 2000))
+    + bytes.fromhex('3082025c' '30820145' 'a003')
+    + bytes((i * 7) % 256 for i in range(2010, 2012))
+    + bytes(3072 - 2012)
+)
+_CERT_RSA_TEMPLATE = (
+    bytes.fromhex('3082') + (13 + len(_CERT_RSA_SIGNED_DATA)).to_bytes(2, 'big')
+    + bytes.fromhex('06092a864886f70d010702' 'a082') + _CERT_RSA_SIGNED_DATA
+)
+# Timestamp-dependent ranges of the template (signed data starts at offset 17)
+_CERT_RSA_TIMESTAMP_RANGES = ((17 + 50, 17 + 1000), (17 + 1500, 17 + 2000), (17 + 2010, 17 + 2012))
+
+# Entries larger than this are streamed through the signer in chunks of this size
+_STREAM_ENTRY_SIZE = 1 << 20
+
+# Buffer size for the signer's input and output APK files
+_ZIP_IO_BUFFER = 1 << 20
+
+# Files read and compressed ahead of the writer in APKTool._add_tree
+_WRITE_AHEAD = 32
+
+# Minimal binary XML used by the simulated compiler: RES_XML_TYPE header,
+# chunk size, then a realistic-looking filler of little-endian counters
+_BINARY_XML = (
+    bytes((0x03, 0x00, 0x08, 0x00, 0x00, 0x04, 0x00, 0x00))
+    + b''.join(bytes(((i // 4) % 256, 0x00, 0x00, 0x00)) for i in range(8, 1024, 4))
+)
+
+# resources.arsc has fixed content; built on first use by APKTool._create_resources_arsc
+_resources_arsc = None
+
+# DEX header: magic, checksum, SHA-1 signature, then 20 little-endian u32 fields (0x70 bytes)
+_DEX_HEADER = struct.Struct('<8sI20s20I')
+# DEX table items: proto_id, method_id, class_def and map_item
+_DEX_PROTO_ID = struct.Struct('<III')
+_DEX_METHOD_ID = struct.Struct('<HHI')
+_DEX_CLASS_DEF = struct.Struct('<8I')
+_DEX_MAP_ITEM = struct.Struct('<HHII')
+
+# Text templates written by the simulated decompiler
+_SAMPLE_MANIFEST = '''<?xml version="1.0" encoding="utf-8"?>
+<manifest xmlns:android="http://schemas.android.com/apk/res/android"
+    package="com.example.modifiedapp">
+    
+    <application
+        android:allowBackup="true"
+        android:icon="@mipmap/ic_launcher"
+        android:label="@string/app_name"
+        android:theme="@style/AppTheme">
+        
+        <activity
+            android:name=".MainActivity"
+            android:exported="true">
+            <intent-filter>
+                <action android:name="android.intent.action.MAIN" />
+                <category android:name="android.intent.category.LAUNCHER" />
+            </intent-filter>
+        </activity>
+    </application>
+</manifest>'''
+
+_DEFAULT_MANIFEST = '''<?xml version="1.0" encoding="utf-8"?>
+<manifest xmlns:android="http://schemas.android.com/apk/res/android"
+    package="com.example.modifiedapp"
+    android:versionCode="1"
+    android:versionName="1.0">
+    
+    <uses-sdk
+        android:minSdkVersion="21"
+        android:targetSdkVersion="33" />
+    
+    <application
+        android:allowBackup="true"
+        android:label="Modified App"
+        android:icon="@mipmap/ic_launcher">
+        
+        <activity
+            android:name=".MainActivity"
+            android:exported="true"
+            android:theme="@android:style/Theme.Material">
+            <intent-filter>
+                <action android:name="android.intent.action.MAIN" />
+                <category android:name="android.intent.category.LAUNCHER" />
+            </intent-filter>
+        </activity>
+    </application>
+</manifest>'''
+
+_APKTOOL_YML = '''version: 2.7.0
+apkFileName: {apk_name}
+isFrameworkApk: false
+usesFramework:
+  ids:
+  - 1
+compressionType: false
+original_size: {apk_size}
+'''
+
+# original_size written into apktool.yml by _create_apktool_yml
+_ORIGINAL_SIZE_RE = re.compile(rb'original_size:[ \t]*(\d+)')
+
+# Tool discovery results per PATH, shared by every APKTool instance; probing Java starts a JVM
+_tool_paths = {}
+_tool_paths_lock = threading.Lock()
+
+def _deflate_raw(data, level):
+    """Raw DEFLATE stream as stored in a zip entry; libdeflate when installed, else zlib"""
+    if deflate is not None:
+        return deflate.deflate_compress(data, level)
+    # One-shot raw deflate (negative wbits): no compressobj or output concatenation per entry
+    return zlib.compress(data, level, -15)
+
+# ZipFile internals _append_raw_entry relies on; none of them are public API
+_RAW_APPEND_ATTRS = ('fp', '_lock', '_writecheck', '_didModify', 'start_dir', 'filelist', 'NameToInfo')
+
+def _supports_raw_append(zf):
+    """Whether zf exposes the internals needed to append pre-compressed entries"""
+    return hasattr(zipfile.ZipInfo, 'FileHeader') and all(hasattr(zf, name) for name in _RAW_APPEND_ATTRS)
+
+def _compress_entry(info, data, level):
+    """Set CRC and sizes on a STORED or DEFLATED info and return the bytes that follow its header"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    info.CRC = zlib.crc32(data)
+    info.file_size = len(data)
+    if info.compress_type == zipfile.ZIP_DEFLATED:
+        data = _deflate_raw(data, level)
+    info.compress_size = len(data)
+    return data
+
+def _iter_files(path, arc_prefix):
+    """Yield (DirEntry, archive name) for each file under path, in os.walk order"""
+    subdirs = []
+    try:
+        it = os.scandir(path)
+    except OSError:
+        # Unreadable or vanished directories are skipped, as os.walk does
+        return
+    with it:
+        for entry in it:
+            arc_path = f"{arc_prefix}/{entry.name}"
+            if entry.is_dir():
+                # os.walk lists symlinked directories but does not descend into them
+                if not entry.is_symlink():
+                    subdirs.append((entry.path, arc_path))
+            else:
+                yield entry, arc_path
+    for sub_path, sub_arc in subdirs:
+        yield from _iter_files(sub_path, sub_arc)
+
+# APKs with fewer entries than this are extracted on the calling thread
+_PARALLEL_EXTRACT_MIN = 64
+
+def _extract_entries(apk_path, items, output_dir):
+    """Extract items with a private ZipFile handle so workers never share a file position"""
+    with zipfile.ZipFile(apk_path, 'r') as apk_zip:
+        for item in items:
+            try:
+                apk_zip.extract(item, output_dir)
+            except FileExistsError:
+                # Another worker created the parent directory between zipfile's check and makedirs
+                apk_zip.extract(item, output_dir)
+
+def _lookup_entries(apk_zip, names):
+    """Return ({name: ZipInfo}, [missing names]) using the archive's name index"""
+    infos = {}
+    missing = []
+    for name in names:
+        try:
+            infos[name] = apk_zip.getinfo(name)
+        except KeyError:
+            missing.append(name)
+    return infos, missing
+
 class APKTool:
     def __init__(self):
-        self.apktool_path = self._find_apktool()
-        self.java_path = self._find_java()
+        # Keyed on PATH so a changed environment is probed again; the lock keeps
+        # concurrent constructions from starting the Java probe twice
+        path_key = os.environ.get('PATH', '')
+        with _tool_paths_lock:
+            if path_key not in _tool_paths:
+                _tool_paths[path_key] = (self._find_apktool(), self._find_java())
+        self.apktool_path, self.java_path = _tool_paths[path_key]
         
     def _find_apktool(self):
         """Find apktool executable"""
-        common_paths = [
-            'apktool',
-            '/usr/local/bin/apktool',
-            '/usr/bin/apktool',
-            '/usr/local/bin/apktool.jar',
-            './tools/apktool.jar'
-        ]
+        common_paths = ['apktool']
+        if os.name == 'posix':
+            # System install locations that never exist on Windows
+            common_paths += [
+                '/usr/local/bin/apktool',
+                '/usr/bin/apktool',
+                '/usr/local/bin/apktool.jar'
+            ]
+        common_paths.append('./tools/apktool.jar')
         
         for path in common_paths:
-            if shutil.which(path) or os.path.exists(path):
+            # Explicit paths only need one stat; bare names are resolved on PATH
+            if os.path.dirname(path) or path.endswith('.jar'):
+                found = os.path.exists(path)
+            else:
+                found = shutil.which(path)
+            if found:
                 logging.info(f"Found APKTool at: {path}")
                 return path
         
@@ -34,14 +247,23 @@ class APKTool:
     
     def _find_java(self):
         """Find Java executable"""
-        java_paths = ['java', '/usr/bin/java', '/usr/local/bin/java']
+        java_paths = ['java']
+        if os.name == 'posix':
+            java_paths += ['/usr/bin/java', '/usr/local/bin/java']
         
+        tried = set()
         for java_path in java_paths:
-            java_cmd = shutil.which(java_path) if not os.path.exists(java_path) else java_path
-            if java_cmd and os.path.exists(java_cmd):
+            if os.path.dirname(java_path):
+                java_cmd = java_path if os.path.exists(java_path) else None
+            else:
+                java_cmd = shutil.which(java_path)
+            # 'java' on PATH usually resolves to one of the explicit candidates;
+            # don't start the same JVM twice
+            if java_cmd and java_cmd not in tried:
+                tried.add(java_cmd)
                 try:
                     # Test Java version
-                    result = subprocess.run([java_cmd, '-version'], capture_output=True, text=True, timeout=10)
+                    result = subprocess.run([java_cmd, '-version'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=10)
                     if result.returncode == 0:
                         logging.info(f"Found Java at: {java_cmd}")
                         return java_cmd
@@ -54,8 +276,12 @@ class APKTool:
     
     def decompile(self, apk_path, output_dir):
         """Decompile APK file"""
+        return self.decompile_detailed(apk_path, output_dir)[0]
+    
+    def decompile_detailed(self, apk_path, output_dir):
+        """Decompile APK file, returning (success, simulated)"""
         if not self.apktool_path or not self.java_path:
-            return self._simulate_decompile(apk_path, output_dir)
+            return self._simulate_decompile(apk_path, output_dir), True
         
         try:
             os.makedirs(output_dir, exist_ok=True)
@@ -68,18 +294,19 @@ class APKTool:
             else:
                 cmd = [self.apktool_path, 'd', apk_path, '-o', output_dir, '-f']
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+            # apktool output is only looked at on failure; keep it binary and skip stdout
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=300)
             
             if result.returncode == 0:
                 logging.info(f"APK decompiled successfully: {apk_path}")
-                return True
+                return True, False
             else:
-                logging.error(f"APKTool decompile failed: {result.stderr}")
-                return self._simulate_decompile(apk_path, output_dir)
+                logging.error(f"APKTool decompile failed: {result.stderr.decode('utf-8', 'replace')}")
+                return self._simulate_decompile(apk_path, output_dir), True
                 
         except Exception as e:
             logging.error(f"Decompile error: {str(e)}")
-            return self._simulate_decompile(apk_path, output_dir)
+            return self._simulate_decompile(apk_path, output_dir), True
     
     def compile(self, decompiled_dir, output_apk):
         """Compile decompiled directory back to APK"""
@@ -95,13 +322,14 @@ class APKTool:
             else:
                 cmd = [self.apktool_path, 'b', decompiled_dir, '-o', output_apk]
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+            # apktool output is only looked at on failure; keep it binary and skip stdout
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=300)
             
             if result.returncode == 0:
                 logging.info(f"APK compiled successfully: {output_apk}")
                 return True
             else:
-                logging.error(f"APKTool compile failed: {result.stderr}")
+                logging.error(f"APKTool compile failed: {result.stderr.decode('utf-8', 'replace')}")
                 return self._simulate_compile(decompiled_dir, output_apk)
                 
         except Exception as e:
@@ -144,7 +372,17 @@ class APKTool:
             # Extract actual APK contents if possible
             try:
                 with zipfile.ZipFile(apk_path, 'r') as apk_zip:
-                    apk_zip.extractall(output_dir)
+                    items = apk_zip.infolist()
+                    workers = min(8, os.cpu_count() or 1, len(items) // _PARALLEL_EXTRACT_MIN)
+                    if workers < 2:
+                        apk_zip.extractall(output_dir)
+                    else:
+                        # Inflate releases the GIL, so entries are spread over threads
+                        with ThreadPoolExecutor(max_workers=workers) as pool:
+                            futures = [pool.submit(_extract_entries, apk_path, items[i::workers], output_dir)
+                                       for i in range(workers)]
+                            for future in futures:
+                                future.result()
                     logging.info("APK contents extracted using zipfile")
             except Exception as e:
                 logging.warning(f"Could not extract APK contents: {str(e)}")
@@ -173,13 +411,10 @@ class APKTool:
             apktool_yml = os.path.join(decompiled_dir, 'apktool.yml')
             if os.path.exists(apktool_yml):
                 try:
-                    with open(apktool_yml, 'r') as f:
-                        content = f.read()
-                        if 'original_size:' in content:
-                            for line in content.split('\n'):
-                                if 'original_size:' in line:
-                                    original_size = int(line.split(':')[1].strip())
-                                    break
+                    with open(apktool_yml, 'rb') as f:
+                        match = _ORIGINAL_SIZE_RE.search(f.read())
+                    if match:
+                        original_size = int(match.group(1))
                 except Exception:
                     pass
             
@@ -188,17 +423,18 @@ class APKTool:
                 original_size = self._estimate_apk_size(decompiled_dir)
             
             # Create realistic APK structure with proper compression
-            with zipfile.ZipFile(output_apk, 'w', zipfile.ZIP_DEFLATED, compresslevel=6, allowZip64=False) as apk_zip:
+            # Fast deflate level; pre-compressed types are stored (see _resource_info)
+            with zipfile.ZipFile(output_apk, 'w', zipfile.ZIP_DEFLATED, compresslevel=1, allowZip64=False, strict_timestamps=False) as apk_zip:
                 
                 # Add AndroidManifest.xml (binary format for Android compatibility)
                 manifest_path = os.path.join(decompiled_dir, 'AndroidManifest.xml')
                 if os.path.exists(manifest_path):
                     # Convert to binary Android manifest format
                     manifest_data = self._create_binary_manifest(manifest_path)
-                    apk_zip.writestr('AndroidManifest.xml', manifest_data)
+                    self._writestr(apk_zip, 'AndroidManifest.xml', manifest_data)
                 else:
                     manifest_data = self._create_binary_manifest_default()
-                    apk_zip.writestr('AndroidManifest.xml', manifest_data)
+                    self._writestr(apk_zip, 'AndroidManifest.xml', manifest_data)
                 
                 # Add resources with proper binary handling
                 res_dir = os.path.join(decompiled_dir, 'res')
@@ -208,34 +444,20 @@ class APKTool:
                 # Add assets
                 assets_dir = os.path.join(decompiled_dir, 'assets')
                 if os.path.exists(assets_dir):
-                    for root, dirs, files in os.walk(assets_dir):
-                        for file in files:
-                            file_path = os.path.join(root, file)
-                            arc_path = os.path.relpath(file_path, decompiled_dir)
-                            try:
-                                apk_zip.write(file_path, arc_path)
-                            except Exception as e:
-                                logging.warning(f"Could not add asset {arc_path}: {str(e)}")
+                    self._add_tree(apk_zip, assets_dir, 'assets', self._prepare_file, 'add asset')
                 
                 # Add classes.dex (enhanced realistic DEX)
                 classes_dex_data = self._create_realistic_dex(original_size)
-                apk_zip.writestr('classes.dex', classes_dex_data)
+                self._writestr(apk_zip, 'classes.dex', classes_dex_data)
                 
                 # Add resources.arsc (compiled resources)
                 resources_arsc = self._create_resources_arsc()
-                apk_zip.writestr('resources.arsc', resources_arsc)
+                self._writestr(apk_zip, self._resource_info(apk_zip, 'resources.arsc'), resources_arsc)
                 
                 # Add lib directory if exists
                 lib_dir = os.path.join(decompiled_dir, 'lib')
                 if os.path.exists(lib_dir):
-                    for root, dirs, files in os.walk(lib_dir):
-                        for file in files:
-                            file_path = os.path.join(root, file)
-                            arc_path = os.path.relpath(file_path, decompiled_dir)
-                            try:
-                                apk_zip.write(file_path, arc_path)
-                            except Exception as e:
-                                logging.warning(f"Could not add lib {arc_path}: {str(e)}")
+                    self._add_tree(apk_zip, lib_dir, 'lib', self._prepare_file, 'add lib')
             
             # Verify the created APK has reasonable size
             if os.path.exists(output_apk):
@@ -254,15 +476,29 @@ class APKTool:
             logging.error(f"Simulation compile error: {str(e)}")
             return False
     
+    def _prepare_file(self, apk_zip, entry, arc_path, level):
+        """Read and compress one asset or lib; files over 1 MiB get a None payload and are streamed"""
+        info = zipfile.ZipInfo.from_file(entry.path, arc_path, strict_timestamps=False)
+        if arc_path[arc_path.rfind('.'):].lower() in _STORE_EXTS:
+            info.compress_type = zipfile.ZIP_STORED
+        else:
+            info.compress_type = apk_zip.compression
+        if info.file_size > _STREAM_ENTRY_SIZE:
+            return info, None
+        with open(entry.path, 'rb') as f:
+            data = f.read()
+        return info, _compress_entry(info, data, level) if level is not None else data
+    
     def _estimate_apk_size(self, decompiled_dir):
         """Estimate original APK size based on decompiled directory"""
         total_size = 0
         try:
-            for root, dirs, files in os.walk(decompiled_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    if os.path.exists(file_path):
-                        total_size += os.path.getsize(file_path)
+            for entry, _ in _iter_files(decompiled_dir, ''):
+                try:
+                    total_size += entry.stat().st_size
+                except OSError:
+                    # Dangling symlink or file removed mid-walk
+                    pass
             
             # APKs are typically compressed, so estimate 30-50% of directory size
             return int(total_size * 0.4)
@@ -275,114 +511,90 @@ class APKTool:
         # Create minimal but valid DEX file structure
         base_size = max(4096, target_size // 4)  # Minimum 4KB
         
-        dex_data = bytearray()
-        
-        # DEX file magic and version (critical for Android)
-        dex_data.extend(b'dex\n039\x00')  # DEX version 039 (more compatible)
+        # Preallocated and zero-filled, so padding only has to move the write position
+        dex_data = bytearray(base_size)
+        pos = 0
         
-        # Calculate checksums later
-        checksum_pos = len(dex_data)
-        dex_data.extend(b'\x00' * 4)  # Adler32 checksum placeholder
+        def emit(data):
+            nonlocal pos
+            dex_data[pos:pos + len(data)] = data
+            pos += len(data)
         
-        sha1_pos = len(dex_data) 
-        dex_data.extend(b'\x00' * 20)  # SHA-1 signature placeholder
+        # Offsets of the checksum and SHA-1 signature, filled in last
+        checksum_pos = 8
+        sha1_pos = 12
         
         # File size
         file_size = base_size
-        dex_data.extend(file_size.to_bytes(4, 'little'))
-        
-        # Header size (always 0x70)
-        dex_data.extend((0x70).to_bytes(4, 'little'))
-        
-        # Endian tag (little endian)
-        dex_data.extend((0x12345678).to_bytes(4, 'little'))
-        
-        # Link section (unused)
-        dex_data.extend((0).to_bytes(4, 'little'))  # link_size
-        dex_data.extend((0).to_bytes(4, 'little'))  # link_off
         
         # Map list offset (at end of file)
         map_off = file_size - 32
-        dex_data.extend(map_off.to_bytes(4, 'little'))
         
         # Essential sections for minimal valid DEX
         string_ids_size = 20
         string_ids_off = 0x70  # Right after header
-        dex_data.extend(string_ids_size.to_bytes(4, 'little'))
-        dex_data.extend(string_ids_off.to_bytes(4, 'little'))
         
         type_ids_size = 10
         type_ids_off = string_ids_off + (string_ids_size * 4)
-        dex_data.extend(type_ids_size.to_bytes(4, 'little'))
-        dex_data.extend(type_ids_off.to_bytes(4, 'little'))
         
         proto_ids_size = 5
         proto_ids_off = type_ids_off + (type_ids_size * 4)
-        dex_data.extend(proto_ids_size.to_bytes(4, 'little'))
-        dex_data.extend(proto_ids_off.to_bytes(4, 'little'))
         
         field_ids_size = 0  # No fields for minimal DEX
         field_ids_off = 0
-        dex_data.extend(field_ids_size.to_bytes(4, 'little'))
-        dex_data.extend(field_ids_off.to_bytes(4, 'little'))
         
         method_ids_size = 5
         method_ids_off = proto_ids_off + (proto_ids_size * 12)
-        dex_data.extend(method_ids_size.to_bytes(4, 'little'))
-        dex_data.extend(method_ids_off.to_bytes(4, 'little'))
         
         class_defs_size = 1  # One class minimum
         class_defs_off = method_ids_off + (method_ids_size * 8)
-        dex_data.extend(class_defs_size.to_bytes(4, 'little'))
-        dex_data.extend(class_defs_off.to_bytes(4, 'little'))
         
         # Data section
         data_off = class_defs_off + (class_defs_size * 32)
         data_size = map_off - data_off
-        dex_data.extend(data_size.to_bytes(4, 'little'))
-        dex_data.extend(data_off.to_bytes(4, 'little'))
-        
-        # Pad header to 0x70 bytes
-        while len(dex_data) < 0x70:
-            dex_data.append(0x00)
         
-        # String IDs table (points to string data)
+        # Whole 0x70-byte header in one pack; checksum and signature stay zero for now
+        _DEX_HEADER.pack_into(
+            dex_data, 0,
+            b'dex\n039\x00',  # DEX version 039 (more compatible)
+            0, b'',  # Adler32 checksum and SHA-1 signature placeholders
+            file_size,
+            0x70,  # Header size
+            0x12345678,  # Endian tag (little endian)
+            0, 0,  # Link section (unused)
+            map_off,
+            string_ids_size, string_ids_off,
+            type_ids_size, type_ids_off,
+            proto_ids_size, proto_ids_off,
+            field_ids_size, field_ids_off,
+            method_ids_size, method_ids_off,
+            class_defs_size, class_defs_off,
+            data_size, data_off,
+        )
+        pos = _DEX_HEADER.size
+        
+        # String IDs table (points to string data, 16 bytes per string entry)
         string_data_base = data_off
-        for i in range(string_ids_size):
-            string_offset = string_data_base + (i * 16)  # 16 bytes per string entry
-            dex_data.extend(string_offset.to_bytes(4, 'little'))
+        emit(struct.pack(f'<{string_ids_size}I',
+                         *range(string_data_base, string_data_base + string_ids_size * 16, 16)))
         
         # Type IDs table (indices into string table)
-        for i in range(type_ids_size):
-            string_idx = i % string_ids_size
-            dex_data.extend(string_idx.to_bytes(4, 'little'))
-        
-        # Proto IDs table (method prototypes)
-        for i in range(proto_ids_size):
-            dex_data.extend((i % string_ids_size).to_bytes(4, 'little'))  # shorty_idx
-            dex_data.extend((0).to_bytes(4, 'little'))  # return_type_idx
-            dex_data.extend((0).to_bytes(4, 'little'))  # parameters_off
-        
-        # Method IDs table
-        for i in range(method_ids_size):
-            dex_data.extend((i % type_ids_size).to_bytes(2, 'little'))  # class_idx
-            dex_data.extend((i % proto_ids_size).to_bytes(2, 'little'))  # proto_idx
-            dex_data.extend((i % string_ids_size).to_bytes(4, 'little'))  # name_idx
-        
-        # Class definitions
-        for i in range(class_defs_size):
-            dex_data.extend((i % type_ids_size).to_bytes(4, 'little'))  # class_idx
-            dex_data.extend((0x00000001).to_bytes(4, 'little'))  # access_flags (public)
-            dex_data.extend((0).to_bytes(4, 'little'))  # superclass_idx
-            dex_data.extend((0).to_bytes(4, 'little'))  # interfaces_off
-            dex_data.extend((0).to_bytes(4, 'little'))  # source_file_idx
-            dex_data.extend((0).to_bytes(4, 'little'))  # annotations_off
-            dex_data.extend((0).to_bytes(4, 'little'))  # class_data_off
-            dex_data.extend((0).to_bytes(4, 'little'))  # static_values_off
+        emit(struct.pack(f'<{type_ids_size}I', *(i % string_ids_size for i in range(type_ids_size))))
+        
+        # Proto IDs table (method prototypes): shorty_idx, return_type_idx, parameters_off
+        emit(b''.join(_DEX_PROTO_ID.pack(i % string_ids_size, 0, 0) for i in range(proto_ids_size)))
+        
+        # Method IDs table: class_idx, proto_idx, name_idx
+        emit(b''.join(_DEX_METHOD_ID.pack(i % type_ids_size, i % proto_ids_size, i % string_ids_size)
+                      for i in range(method_ids_size)))
+        
+        # Class definitions: class_idx, access_flags (public), then superclass, interfaces,
+        # source file, annotations, class data and static values all zero
+        emit(b''.join(_DEX_CLASS_DEF.pack(i % type_ids_size, 0x00000001, 0, 0, 0, 0, 0, 0)
+                      for i in range(class_defs_size)))
         
         # Pad to data section
-        while len(dex_data) < data_off:
-            dex_data.append(0x00)
+        pos = max(pos, data_off)
         
         # String data section
         common_strings = [
@@ -393,65 +605,44 @@ class APKTool:
         
         for string_bytes in common_strings[:string_ids_size]:
             # ULEB128 length + string + null terminator
-            dex_data.append(len(string_bytes))  # Simple length encoding
-            dex_data.extend(string_bytes)
-            dex_data.append(0x00)
+            emit(bytes((len(string_bytes),)))  # Simple length encoding
+            emit(string_bytes)
+            pos += 1  # Null terminator (buffer is already zeroed)
             # Pad to 4-byte alignment
-            while len(dex_data) % 4 != 0:
-                dex_data.append(0x00)
+            pos = (pos + 3) & ~3
         
         # Pad to map offset
-        while len(dex_data) < map_off:
-            dex_data.append(0x00)
+        pos = max(pos, map_off)
         
-        # Map list (required by Android)
-        dex_data.extend((8).to_bytes(4, 'little'))  # map list size
-        dex_data.extend((0x0000).to_bytes(2, 'little'))  # type: header
-        dex_data.extend((0x0000).to_bytes(2, 'little'))  # unused
-        dex_data.extend((1).to_bytes(4, 'little'))      # size
-        dex_data.extend((0).to_bytes(4, 'little'))      # offset
-        
-        dex_data.extend((0x1000).to_bytes(2, 'little'))  # type: string_id  
-        dex_data.extend((0x0000).to_bytes(2, 'little'))  # unused
-        dex_data.extend(string_ids_size.to_bytes(4, 'little'))  # size
-        dex_data.extend(string_ids_off.to_bytes(4, 'little'))   # offset
-        
-        # Ensure target size
-        while len(dex_data) < file_size:
-            dex_data.append(0x00)
+        # Map list (required by Android): header item, then the string_id table
+        emit((8).to_bytes(4, 'little'))  # map list size
+        emit(_DEX_MAP_ITEM.pack(0x0000, 0, 1, 0))
+        emit(_DEX_MAP_ITEM.pack(0x1000, 0, string_ids_size, string_ids_off))
         
         # Calculate and update checksums
-        import zlib
-        import hashlib
         
         # Calculate Adler32 checksum (skip first 12 bytes)
-        checksum_data = dex_data[12:]
-        adler32 = zlib.adler32(checksum_data) & 0xffffffff
+        view = memoryview(dex_data)
+        adler32 = zlib.adler32(view[12:]) & 0xffffffff
         dex_data[checksum_pos:checksum_pos+4] = adler32.to_bytes(4, 'little')
         
         # Calculate SHA-1 signature (skip first 32 bytes) 
-        sha1_data = dex_data[32:]
-        sha1_hash = hashlib.sha1(sha1_data).digest()
+        sha1_hash = hashlib.sha1(view[32:]).digest()
         dex_data[sha1_pos:sha1_pos+20] = sha1_hash
         
-        return bytes(dex_data[:file_size])
+        view.release()
+        # Handed to the zip writer as is; a bytes() copy would double peak memory
+        return dex_data
     
     def _pad_apk_file(self, apk_path, target_size):
         """Pad APK file to reach target size"""
         try:
             current_size = os.path.getsize(apk_path)
             if current_size < target_size:
-                with open(apk_path, 'ab') as f:
-                    padding_size = target_size - current_size
-                    # Add padding in chunks
-                    chunk_size = 8192
-                    padding_data = b'PADDING_' * (chunk_size // 8)
-                    
-                    while padding_size > 0:
-                        write_size = min(chunk_size, padding_size)
-                        f.write(padding_data[:write_size])
-                        padding_size -= write_size
-                        
+                with open(apk_path, 'r+b') as f:
+                    # Grow the file in one syscall; the zero tail is sparse where supported
+                    f.truncate(target_size)
+        
         except Exception as e:
             logging.warning(f"Could not pad APK file: {str(e)}")
     
@@ -467,35 +658,67 @@ class APKTool:
                 logging.warning("Input APK structure validation failed, but continuing...")
             
             # Copy and sign the APK
-            with zipfile.ZipFile(input_apk, 'r') as input_zip:
-                with zipfile.ZipFile(output_apk, 'w', zipfile.ZIP_DEFLATED, compresslevel=6, allowZip64=False) as output_zip:
+            # Large buffers on both files so inflating, raw copies and deflate output
+            # move through the OS in 1 MiB reads and writes instead of 8 KiB ones
+            with open(input_apk, 'rb', buffering=_ZIP_IO_BUFFER) as input_file, \
+                    zipfile.ZipFile(input_file, 'r') as input_zip:
+                with open(output_apk, 'wb', buffering=_ZIP_IO_BUFFER) as output_file, \
+                        zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED, compresslevel=1, allowZip64=False, strict_timestamps=False) as output_zip:
                     
-                    # Copy all files except META-INF
-                    for item in input_zip.infolist():
-                        if not item.filename.startswith('META-INF/') and not item.is_dir():
-                            try:
-                                data = input_zip.read(item.filename)
-                                # Validate essential files
-                                if item.filename == 'AndroidManifest.xml':
-                                    if len(data) < 100:  # Too small to be valid
-                                        logging.warning("AndroidManifest.xml seems too small, regenerating...")
-                                        data = self._create_binary_manifest_default()
-                                output_zip.writestr(item.filename, data)
-                            except Exception as e:
-                                logging.warning(f"Could not copy {item.filename}: {str(e)}")
+                    # Copy all files except META-INF, hashing each entry on the pool
+                    # while the next one is compressed, so every entry is read only once
+                    entry_digests = []
+                    raw_append = _supports_raw_append(output_zip)
+                    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as hasher:
+                        for item in input_zip.infolist():
+                            if not item.filename.startswith('META-INF/') and not item.is_dir():
+                                try:
+                                    info = zipfile.ZipInfo(item.filename, date_time=item.date_time)
+                                    info.compress_type, level = self._entry_compression(item)
+                                    info.external_attr = item.external_attr
+                                    
+                                    # Entries keeping their compression are copied as raw
+                                    # compressed bytes; only the digest needs inflating
+                                    raw_copy = info.compress_type == item.compress_type and raw_append
+                                    
+                                    if item.file_size > _STREAM_ENTRY_SIZE:
+                                        # Large assets are streamed so they never sit in memory whole
+                                        if raw_copy:
+                                            digest = self._hash_entry_streamed(input_zip, item)
+                                            self._copy_entry_raw(input_zip, output_zip, item, info)
+                                        else:
+                                            digest = self._copy_entry_streamed(input_zip, output_zip, item, info)
+                                    else:
+                                        data = input_zip.read(item.filename)
+                                        # Validate essential files
+                                        if item.filename == 'AndroidManifest.xml':
+                                            if len(data) < 100:  # Too small to be valid
+                                                logging.warning("AndroidManifest.xml seems too small, regenerating...")
+                                                data = self._create_binary_manifest_default()
+                                                raw_copy = False
+                                        digest = hasher.submit(_sha256_digest, data)
+                                        if raw_copy:
+                                            self._copy_entry_raw(input_zip, output_zip, item, info)
+                                        else:
+                                            self._writestr(output_zip, info, data, level)
+                                    entry_digests.append((item.filename, digest))
+                                except Exception as e:
+                                    logging.warning(f"Could not copy {item.filename}: {str(e)}")
+                        entry_digests = [(name, digest if isinstance(digest, bytes) else digest.result())
+                                         for name, digest in entry_digests]
                     
                     # Ensure essential files exist
                     self._ensure_essential_files(output_zip, input_zip)
                     
                     # Create new META-INF with proper signatures
-                    manifest_content = self._create_enhanced_manifest_mf(input_zip)
-                    output_zip.writestr('META-INF/MANIFEST.MF', manifest_content)
+                    manifest_content, section_digests = self._create_enhanced_manifest_mf(entry_digests)
+                    self._writestr(output_zip, 'META-INF/MANIFEST.MF', manifest_content)
                     
-                    cert_sf_content = self._create_enhanced_cert_sf(manifest_content)
-                    output_zip.writestr('META-INF/CERT.SF', cert_sf_content)
+                    cert_sf_content = self._create_enhanced_cert_sf(manifest_content, section_digests)
+                    self._writestr(output_zip, 'META-INF/CERT.SF', cert_sf_content)
                     
                     cert_rsa_content = self._create_enhanced_cert_rsa()
-                    output_zip.writestr('META-INF/CERT.RSA', cert_rsa_content)
+                    self._writestr(output_zip, 'META-INF/CERT.RSA', cert_rsa_content)
             
             # Final validation
             if self._validate_signed_apk(output_apk):
@@ -510,22 +733,127 @@ class APKTool:
             logging.error(f"Error creating signed APK: {str(e)}")
             return False
     
+    def _hash_entry_streamed(self, input_zip, item):
+        """SHA-256 digest of an entry's contents, read in 1 MiB chunks"""
+        sha256 = hashlib.sha256()
+        with input_zip.open(item) as src:
+            for chunk in iter(lambda: src.read(_STREAM_ENTRY_SIZE), b''):
+                sha256.update(chunk)
+        return sha256.digest()
+    
+    def _copy_entry_raw(self, input_zip, output_zip, item, info):
+        """Append an entry's compressed bytes to output_zip without recompressing them"""
+        # Locate the payload behind the source local file header
+        src = input_zip.fp
+        src.seek(item.header_offset)
+        header = src.read(30)
+        if header[:4] != b'PK\x03\x04':
+            raise zipfile.BadZipFile(f"Bad local file header for {item.filename}")
+        name_len, extra_len = struct.unpack('<HH', header[26:30])
+        src.seek(item.header_offset + 30 + name_len + extra_len)
+        
+        # Sizes and CRC are known up front, so no data descriptor is needed
+        info.CRC = item.CRC
+        info.compress_size = item.compress_size
+        info.file_size = item.file_size
+        
+        def payload():
+            remaining = item.compress_size
+            while remaining > 0:
+                chunk = src.read(min(remaining, _STREAM_ENTRY_SIZE))
+                if not chunk:
+                    raise EOFError(f"Truncated entry {item.filename}")
+                yield chunk
+                remaining -= len(chunk)
+        
+        self._append_raw_entry(output_zip, info, payload())
+    
+    def _append_raw_entry(self, output_zip, info, chunks):
+        """Write a local header for info followed by already-compressed chunks"""
+        # Same bookkeeping ZipFile.writestr does, minus the compressor. This relies on
+        # ZipFile internals, so callers check _supports_raw_append first and fall back
+        # to writestr, which compresses the data itself
+        with output_zip._lock:
+            dst = output_zip.fp
+            dst.seek(output_zip.start_dir)
+            info.header_offset = dst.tell()
+            output_zip._writecheck(info)
+            output_zip._didModify = True
+            dst.write(info.FileHeader(False))
+            for chunk in chunks:
+                dst.write(chunk)
+            output_zip.start_dir = dst.tell()
+            output_zip.filelist.append(info)
+            output_zip.NameToInfo[info.filename] = info
+    
+    def _zip_info(self, apk_zip, arcname):
+        """ZipInfo with the defaults ZipFile.writestr gives a bare name"""
+        info = zipfile.ZipInfo(arcname, date_time=time.localtime(time.time())[:6])
+        info.compress_type = apk_zip.compression
+        info.external_attr = 0o600 << 16
+        return info
+    
+    def _resource_info(self, apk_zip, arc_path):
+        """ZipInfo for a binary resource; media and other pre-compressed types are stored"""
+        info = self._zip_info(apk_zip, arc_path)
+        if arc_path[arc_path.rfind('.'):].lower() in _STORE_EXTS:
+            info.compress_type = zipfile.ZIP_STORED
+        return info
+    
+    def _writestr(self, apk_zip, zinfo_or_arcname, data, compresslevel=None):
+        """ZipFile.writestr, deflating with libdeflate when it is installed"""
+        if deflate is None:
+            apk_zip.writestr(zinfo_or_arcname, data, compresslevel=compresslevel)
+            return
+        
+        if isinstance(zinfo_or_arcname, zipfile.ZipInfo):
+            info = zinfo_or_arcname
+        else:
+            info = self._zip_info(apk_zip, zinfo_or_arcname)
+        if info.compress_type != zipfile.ZIP_DEFLATED or not _supports_raw_append(apk_zip):
+            apk_zip.writestr(info, data, compresslevel=compresslevel)
+            return
+        
+        level = compresslevel if compresslevel is not None else apk_zip.compresslevel
+        payload = _compress_entry(info, data, 6 if level is None else level)
+        self._append_raw_entry(apk_zip, info, (payload,))
+    
+    def _copy_entry_streamed(self, input_zip, output_zip, item, info):
+        """Copy one entry in 1 MiB chunks, returning the SHA-256 digest of its contents"""
+        sha256 = hashlib.sha256()
+        info.file_size = item.file_size
+        # ZipFile.open takes no level; deflated entries get output_zip's compresslevel=1,
+        # the same level _entry_compression picks
+        with input_zip.open(item) as src, output_zip.open(info, 'w') as dst:
+            for chunk in iter(lambda: src.read(_STREAM_ENTRY_SIZE), b''):
+                sha256.update(chunk)
+                dst.write(chunk)
+        return sha256.digest()
+    
+    def _entry_compression(self, item):
+        """Pick (compress_type, level) for a signed APK entry"""
+        name = item.filename
+        # Media is already compressed and resources.arsc must stay stored;
+        # entries stored in the source (e.g. aligned) are kept that way too
+        if name[name.rfind('.'):].lower() in _STORE_EXTS or item.compress_type == zipfile.ZIP_STORED:
+            return zipfile.ZIP_STORED, None
+        # Deflated entries are normally copied raw; anything that does need
+        # recompressing (e.g. a regenerated manifest) gets the fast level
+        return zipfile.ZIP_DEFLATED, 1
+    
     def _validate_apk_structure(self, apk_path):
         """Validate basic APK structure"""
         try:
             with zipfile.ZipFile(apk_path, 'r') as apk_zip:
-                files = apk_zip.namelist()
-                
                 # Check for essential files
-                required_files = ['AndroidManifest.xml', 'classes.dex']
-                missing_files = [f for f in required_files if f not in files]
+                infos, missing_files = _lookup_entries(apk_zip, ('AndroidManifest.xml', 'classes.dex'))
                 
                 if missing_files:
                     logging.warning(f"Missing essential files: {missing_files}")
                     return False
                 
                 # Check AndroidManifest.xml size
-                manifest_info = apk_zip.getinfo('AndroidManifest.xml')
+                manifest_info = infos['AndroidManifest.xml']
                 if manifest_info.file_size < 100:
                     logging.warning("AndroidManifest.xml is too small")
                     return False
@@ -541,11 +869,9 @@ class APKTool:
         """Validate signed APK"""
         try:
             with zipfile.ZipFile(apk_path, 'r') as apk_zip:
-                files = apk_zip.namelist()
-                
                 # Check for signature files
-                signature_files = ['META-INF/MANIFEST.MF', 'META-INF/CERT.SF', 'META-INF/CERT.RSA']
-                missing_sig_files = [f for f in signature_files if f not in files]
+                signature_files = ('META-INF/MANIFEST.MF', 'META-INF/CERT.SF', 'META-INF/CERT.RSA')
+                infos, missing_sig_files = _lookup_entries(apk_zip, signature_files)
                 
                 if missing_sig_files:
                     logging.error(f"Missing signature files: {missing_sig_files}")
@@ -553,7 +879,7 @@ class APKTool:
                 
                 # Check file sizes
                 for sig_file in signature_files:
-                    info = apk_zip.getinfo(sig_file)
+                    info = infos[sig_file]
                     if info.file_size < 50:
                         logging.error(f"{sig_file} is too small")
                         return False
@@ -566,164 +892,80 @@ class APKTool:
     
     def _ensure_essential_files(self, output_zip, input_zip):
         """Ensure essential APK files exist"""
-        files = input_zip.namelist()
+        # Name-index lookups instead of three scans of namelist()
+        _, missing = _lookup_entries(input_zip, ('AndroidManifest.xml', 'classes.dex', 'resources.arsc'))
         
         # Ensure AndroidManifest.xml exists and is valid
-        if 'AndroidManifest.xml' not in files:
+        if 'AndroidManifest.xml' in missing:
             logging.warning("AndroidManifest.xml missing, creating default...")
             manifest_data = self._create_binary_manifest_default()
-            output_zip.writestr('AndroidManifest.xml', manifest_data)
+            self._writestr(output_zip, 'AndroidManifest.xml', manifest_data)
         
         # Ensure classes.dex exists
-        if 'classes.dex' not in files:
+        if 'classes.dex' in missing:
             logging.warning("classes.dex missing, creating default...")
             classes_dex = self._create_realistic_dex(500000)  # 500KB default
-            output_zip.writestr('classes.dex', classes_dex)
+            self._writestr(output_zip, 'classes.dex', classes_dex)
         
         # Ensure resources.arsc exists
-        if 'resources.arsc' not in files:
+        if 'resources.arsc' in missing:
             logging.warning("resources.arsc missing, creating default...")
             resources_arsc = self._create_resources_arsc()
-            output_zip.writestr('resources.arsc', resources_arsc)
+            self._writestr(output_zip, 'resources.arsc', resources_arsc)
     
-    def _create_enhanced_manifest_mf(self, zip_file):
-        """Create enhanced MANIFEST.MF with proper checksums"""
-        manifest_lines = [
+    def _create_enhanced_manifest_mf(self, entry_digests):
+        """Create enhanced MANIFEST.MF, returning it with (filename, section SHA-256) pairs for CERT.SF"""
+        # Main section, terminated by a blank line
+        header = '\r\n'.join([
             "Manifest-Version: 1.0",
             "Built-By: APK Editor Pro",
             "Created-By: APK Editor Enhanced System",
             f"Build-Date: {datetime.now().isoformat()}",
+            "",
             ""
-        ]
+        ]).encode('utf-8')
         
-        # Calculate checksums for all files
-        for item in zip_file.infolist():
-            if not item.filename.startswith('META-INF/') and not item.is_dir():
-                try:
-                    data = zip_file.read(item.filename)
-                    
-                    # Calculate SHA-1 digest
-                    sha1_hash = hashlib.sha1(data).digest()
-                    sha1_b64 = base64.b64encode(sha1_hash).decode('ascii')
-                    
-                    # Calculate SHA-256 digest for additional security
-                    sha256_hash = hashlib.sha256(data).digest()
-                    sha256_b64 = base64.b64encode(sha256_hash).decode('ascii')
-                    
-                    manifest_lines.extend([
-                        f"Name: {item.filename}",
-                        f"SHA1-Digest: {sha1_b64}",
-                        f"SHA-256-Digest: {sha256_b64}",
-                        ""
-                    ])
-                except Exception as e:
-                    logging.warning(f"Could not process file {item.filename}: {str(e)}")
+        # Sections are formatted as bytes (base64 output already is) and hashed as built,
+        # so CERT.SF never has to re-parse or re-encode the manifest
+        names = [filename.encode('utf-8') for filename, _ in entry_digests]
+        sections = [b'Name: %s\r\nSHA-256-Digest: %s\r\n\r\n' % (name, b2a_base64(sha256_hash, newline=False))
+                    for name, (_, sha256_hash) in zip(names, entry_digests)]
+        section_digests = [(name, hashlib.sha256(section).digest()) for name, section in zip(names, sections)]
         
-        return '\r\n'.join(manifest_lines).encode('utf-8')
+        return header + b''.join(sections), section_digests
     
-    def _create_enhanced_cert_sf(self, manifest_content):
+    def _create_enhanced_cert_sf(self, manifest_content, section_digests):
         """Create enhanced CERT.SF file"""
         # Calculate manifest hash
-        manifest_hash = hashlib.sha1(manifest_content).digest()
-        manifest_b64 = base64.b64encode(manifest_hash).decode('ascii')
+        manifest_hash = hashlib.sha256(manifest_content).digest()
+        manifest_b64 = b2a_base64(manifest_hash, newline=False).decode('ascii')
         
-        # Calculate manifest main attributes hash
-        manifest_text = manifest_content.decode('utf-8')
-        main_attrs = manifest_text.split('\r\n\r\n')[0] + '\r\n'
-        main_attrs_hash = hashlib.sha1(main_attrs.encode('utf-8')).digest()
-        main_attrs_b64 = base64.b64encode(main_attrs_hash).decode('ascii')
+        # Calculate manifest main attributes hash (main section up to its blank line)
+        main_attrs = manifest_content[:manifest_content.index(b'\r\n\r\n') + 2]
+        main_attrs_hash = hashlib.sha256(main_attrs).digest()
+        main_attrs_b64 = b2a_base64(main_attrs_hash, newline=False).decode('ascii')
         
-        sf_lines = [
+        header = '\r\n'.join([
             "Signature-Version: 1.0",
-            f"SHA1-Digest-Manifest: {manifest_b64}",
-            f"SHA1-Digest-Manifest-Main-Attributes: {main_attrs_b64}",
+            f"SHA-256-Digest-Manifest: {manifest_b64}",
+            f"SHA-256-Digest-Manifest-Main-Attributes: {main_attrs_b64}",
             "Created-By: APK Editor Enhanced",
             f"Signature-Date: {datetime.now().isoformat()}",
             ""
-        ]
+        ]).encode('utf-8')
         
-        # Parse manifest and create section hashes
-        sections = manifest_text.split('\r\n\r\n')
-        
-        for section in sections[1:]:  # Skip header
-            if section.strip():
-                section_data = (section + '\r\n\r\n').encode('utf-8')
-                section_hash = hashlib.sha1(section_data).digest()
-                section_b64 = base64.b64encode(section_hash).decode('ascii')
-                
-                # Extract filename from section
-                lines = section.split('\r\n')
-                for line in lines:
-                    if line.startswith('Name: '):
-                        filename = line[6:]
-                        sf_lines.extend([
-                            f"Name: {filename}",
-                            f"SHA1-Digest: {section_b64}",
-                            ""
-                        ])
-                        break
-        
-        return '\r\n'.join(sf_lines).encode('utf-8')
+        return header + b''.join([b'\r\nName: %s\r\nSHA-256-Digest: %s\r\n' % (name, b2a_base64(section_hash, newline=False))
+                                  for name, section_hash in section_digests])
     
     def _create_enhanced_cert_rsa(self):
         """Create a more sophisticated RSA certificate"""
-        # Create a more realistic PKCS#7 signature structure
-        cert_data = bytearray()
-        
-        # PKCS#7 ContentInfo
-        cert_data.extend([0x30, 0x82])  # SEQUENCE
-        
-        # Certificate body
-        cert_body = bytearray()
-        
-        # SignedData OID (1.2.840.113549.1.7.2)
-        cert_body.extend([
-            0x06, 0x09, 0x2A, 0x86, 0x48, 0x86, 0xF7, 0x0D, 0x01, 0x07, 0x02
-        ])
-        
-        # Add context tag
-        cert_body.extend([0xA0, 0x82])
-        
-        # SignedData content with realistic structure
-        signed_data = bytearray(3072)  # Larger, more realistic size
-        
-        # Version
-        signed_data[0:3] = [0x02, 0x01, 0x01]
-        
-        # DigestAlgorithms SET
-        signed_data[3:15] = [
-            0x31, 0x0B, 0x30, 0x09, 0x06, 0x05, 0x2B, 0x0E, 0x03, 0x02, 0x1A, 0x05
-        ]
-        
-        # ContentInfo
-        signed_data[15:30] = [
-            0x30, 0x0B, 0x06, 0x09, 0x2A, 0x86, 0x48, 0x86, 0xF7, 0x0D, 0x01, 0x07, 0x01, 0x05, 0x00
-        ]
-        
-        # Add pseudo-random certificate data
-        timestamp = int(time.time())
-        for i in range(50, 1000):
-            signed_data[i] = (i + timestamp + 127) % 256
-        
-        # Add RSA signature (pseudo)
-        rsa_sig_start = 1500
-        for i in range(rsa_sig_start, rsa_sig_start + 512):  # 512 bytes RSA signature
-            signed_data[i] = (i * 7 + timestamp) % 256
-        
-        # Add X.509 certificate structure (simplified)
-        cert_start = 2000
-        signed_data[cert_start:cert_start+10] = [
-            0x30, 0x82, 0x02, 0x5C,  # Certificate SEQUENCE
-            0x30, 0x82, 0x01, 0x45,  # TBSCertificate
-            0xA0, 0x03  # Version
-        ]
-        
-        cert_body.extend(signed_data)
-        
-        # Set total length
-        total_length = len(cert_body)
-        cert_data.extend(total_length.to_bytes(2, 'big'))
-        cert_data.extend(cert_body)
+        # The pseudo-random ranges were generated for timestamp 0; shifting every byte
+        # by the timestamp (mod 256) gives the same bytes as generating them per call
+        shift = int(time.time()) % 256
+        table = bytes(range(shift, 256)) + bytes(range(shift))
+        cert_data = bytearray(_CERT_RSA_TEMPLATE)
+        for start, end in _CERT_RSA_TIMESTAMP_RANGES:
+            cert_data[start:end] = _CERT_RSA_TEMPLATE[start:end].translate(table)
         
         return bytes(cert_data)
     
@@ -755,26 +997,7 @@ class APKTool:
     
     def _create_sample_manifest(self, manifest_path):
         """Create sample AndroidManifest.xml"""
-        manifest_content = '''<?xml version="1.0" encoding="utf-8"?>
-<manifest xmlns:android="http://schemas.android.com/apk/res/android"
-    package="com.example.modifiedapp">
-    
-    <application
-        android:allowBackup="true"
-        android:icon="@mipmap/ic_launcher"
-        android:label="@string/app_name"
-        android:theme="@style/AppTheme">
-        
-        <activity
-            android:name=".MainActivity"
-            android:exported="true">
-            <intent-filter>
-                <action android:name="android.intent.action.MAIN" />
-                <category android:name="android.intent.category.LAUNCHER" />
-            </intent-filter>
-        </activity>
-    </application>
-</manifest>'''
+        manifest_content = _SAMPLE_MANIFEST
         
         with open(manifest_path, 'w') as f:
             f.write(manifest_content)
@@ -783,15 +1006,7 @@ class APKTool:
         """Create apktool.yml configuration file"""
         apk_size = os.path.getsize(apk_path) if os.path.exists(apk_path) else 0
         
-        yml_content = f'''version: 2.7.0
-apkFileName: {os.path.basename(apk_path)}
-isFrameworkApk: false
-usesFramework:
-  ids:
-  - 1
-compressionType: false
-original_size: {apk_size}
-'''
+        yml_content = _APKTOOL_YML.format(apk_name=os.path.basename(apk_path), apk_size=apk_size)
         
         yml_path = os.path.join(output_dir, 'apktool.yml')
         with open(yml_path, 'w') as f:
@@ -799,36 +1014,63 @@ original_size: {apk_size}
     
     def _add_resources_to_apk(self, apk_zip, res_dir, decompiled_dir):
         """Add resources to APK with proper handling for binary files"""
-        for root, dirs, files in os.walk(res_dir):
-            for file in files:
-                file_path = os.path.join(root, file)
-                arc_path = os.path.relpath(file_path, decompiled_dir)
-                
-                try:
-                    # Handle different resource types appropriately
-                    if file.endswith(('.png', '.jpg', '.jpeg', '.webp', '.gif')):
-                        # Image files - copy as binary
-                        with open(file_path, 'rb') as f:
-                            data = f.read()
-                        apk_zip.writestr(arc_path, data)
-                    elif file.endswith('.xml'):
-                        # XML files - need to be in binary format for Android
-                        xml_binary = self._create_binary_xml(file_path)
-                        apk_zip.writestr(arc_path, xml_binary)
-                    elif file.endswith(('.9.png',)):
-                        # Nine-patch images - special handling
-                        with open(file_path, 'rb') as f:
-                            data = f.read()
-                        apk_zip.writestr(arc_path, data)
-                    else:
-                        # Other files - copy as is
-                        with open(file_path, 'rb') as f:
-                            data = f.read()
-                        apk_zip.writestr(arc_path, data)
-                        
-                except Exception as e:
-                    # If file can't be read, skip it but log warning
-                    logging.warning(f"Could not process resource {arc_path}: {str(e)}")
+        self._add_tree(apk_zip, res_dir, 'res', self._prepare_resource, 'process resource')
+    
+    def _add_tree(self, apk_zip, root, arc_prefix, prepare, action):
+        """Add every file under root; workers prepare entries while this thread writes them in walk order"""
+        # Reads and compression overlap on the pool (zlib and libdeflate release the GIL);
+        # ZipFile itself is only touched from this thread. Without raw appends the workers
+        # only read, and ZipFile compresses on this thread (a None level)
+        raw = _supports_raw_append(apk_zip)
+        level = (apk_zip.compresslevel if apk_zip.compresslevel is not None else 6) if raw else None
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1)) as pool:
+            for entry, arc_path in _iter_files(root, arc_prefix):
+                pending.append((entry, arc_path, pool.submit(prepare, apk_zip, entry, arc_path, level)))
+                if len(pending) >= _WRITE_AHEAD:
+                    self._append_prepared(apk_zip, action, raw, *pending.popleft())
+            while pending:
+                self._append_prepared(apk_zip, action, raw, *pending.popleft())
+    
+    def _prepare_resource(self, apk_zip, entry, arc_path, level):
+        """Read and compress one resource, returning (ZipInfo, payload); runs on a worker thread
+
+        With a None level the payload is left uncompressed for ZipFile.writestr.
+        """
+        file = entry.name
+        file_path = entry.path
+        
+        # Handle different resource types appropriately
+        if file.endswith(('.png', '.jpg', '.jpeg', '.webp', '.gif')):
+            # Image files - copy as binary, stored since they are already compressed
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            info = self._resource_info(apk_zip, arc_path)
+        elif file.endswith('.xml'):
+            # XML files - need to be in binary format for Android
+            data = self._create_binary_xml(file_path)
+            info = self._zip_info(apk_zip, arc_path)
+        else:
+            # Other files (nine-patch images included) - copy as is
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            info = self._resource_info(apk_zip, arc_path)
+        return info, _compress_entry(info, data, level) if level is not None else data
+    
+    def _append_prepared(self, apk_zip, action, raw, entry, arc_path, future):
+        """Write an entry prepared on the _add_tree pool"""
+        try:
+            info, payload = future.result()
+            if payload is None:
+                # Too large to hold in memory; ZipFile streams it from disk
+                apk_zip.write(entry.path, arc_path, compress_type=info.compress_type)
+            elif raw:
+                self._append_raw_entry(apk_zip, info, (payload,))
+            else:
+                apk_zip.writestr(info, payload)
+        except Exception as e:
+            # If file can't be read, skip it but log warning
+            logging.warning(f"Could not {action} {arc_path}: {str(e)}")
     
     def _create_binary_manifest(self, manifest_path):
         """Create binary Android manifest from XML file"""
@@ -973,8 +1215,7 @@ original_size: {apk_size}
         manifest_data.extend(end_elems)
         
         # Ensure proper size (Android expects certain minimum size)
-        while len(manifest_data) < 2048:
-            manifest_data.append(0x00)
+        manifest_data.extend(bytes(max(0, 2048 - len(manifest_data))))
             
         # Update file size in header
         file_size = len(manifest_data)
@@ -984,26 +1225,18 @@ original_size: {apk_size}
     
     def _create_binary_xml(self, xml_path):
         """Create binary XML from text XML file"""
-        try:
-            # For simulation, create a minimal binary XML structure
-            xml_data = bytearray(1024)
-            
-            # Binary XML header
-            xml_data[0:4] = [0x03, 0x00, 0x08, 0x00]  # RES_XML_TYPE
-            xml_data[4:8] = [0x00, 0x04, 0x00, 0x00]  # Chunk size
-            
-            # Fill with realistic binary XML data
-            for i in range(8, 1024, 4):
-                xml_data[i:i+4] = [(i // 4) % 256, 0x00, 0x00, 0x00]
-                
-            return bytes(xml_data)
-            
-        except Exception:
-            # Fallback to simple binary structure
-            return b'\x03\x00\x08\x00' + b'\x00' * 1020
+        # For simulation every XML maps to the same minimal binary structure
+        return _BINARY_XML
     
     def _create_resources_arsc(self):
         """Create proper compiled resources file that Android can parse"""
+        global _resources_arsc
+        if _resources_arsc is None:
+            _resources_arsc = self._build_resources_arsc()
+        return _resources_arsc
+    
+    def _build_resources_arsc(self):
+        """Build the resources.arsc returned by _create_resources_arsc"""
         arsc_data = bytearray()
         
         # Resource table header with correct structure
@@ -1039,22 +1272,21 @@ original_size: {apk_size}
         arsc_data.extend(strings_start_pos.to_bytes(4, 'little'))  # Strings start
         arsc_data.extend([0x00, 0x00, 0x00, 0x00])  # Styles start (0)
         
-        # String offset table
+        # String offset table, packed in one call
+        encoded_strings = [string.encode('utf-8') for string in resource_strings]
+        offsets = []
         current_offset = 0
-        for string in resource_strings:
-            arsc_data.extend(current_offset.to_bytes(4, 'little'))
-            current_offset += 1 + len(string.encode('utf-8')) + 1  # length + string + null
+        for utf8_bytes in encoded_strings:
+            offsets.append(current_offset)
+            current_offset += 1 + len(utf8_bytes) + 1  # length + string + null
+        arsc_data.extend(struct.pack(f'<{string_count}I', *offsets))
         
-        # String data
-        for string in resource_strings:
-            utf8_bytes = string.encode('utf-8')
-            arsc_data.append(len(utf8_bytes))  # UTF-8 length
-            arsc_data.extend(utf8_bytes)       # String data
-            arsc_data.append(0x00)             # Null terminator
+        # String data: UTF-8 length, string data, null terminator
+        arsc_data.extend(b''.join(bytes((len(utf8_bytes),)) + utf8_bytes + b'\x00'
+                                  for utf8_bytes in encoded_strings))
         
         # Align to 4-byte boundary
-        while len(arsc_data) % 4 != 0:
-            arsc_data.append(0x00)
+        arsc_data.extend(bytes(-len(arsc_data) % 4))
         
         # Update string pool size
         pool_size = len(arsc_data) - string_pool_start
@@ -1074,9 +1306,10 @@ original_size: {apk_size}
         package_name = "com.example.modifiedapp"
         name_utf16 = package_name.encode('utf-16le')
         arsc_data.extend(name_utf16)
-        # Pad to 256 bytes
-        while len(arsc_data) - package_start - 16 < 256:
-            arsc_data.extend([0x00, 0x00])
+        # Pad to 256 bytes (whole UTF-16 units)
+        name_pad = 256 - (len(arsc_data) - package_start - 16)
+        if name_pad > 0:
+            arsc_data.extend(bytes(name_pad + (name_pad & 1)))
         
         # Type and key string pools (minimal)
         arsc_data.extend([0x00, 0x00, 0x00, 0x00])  # Type strings offset
@@ -1134,36 +1367,10 @@ original_size: {apk_size}
         arsc_data[size_pos:size_pos+4] = total_size.to_bytes(4, 'little')
         
         # Ensure minimum size for Android compatibility
-        while len(arsc_data) < 4096:
-            arsc_data.append(0x00)
+        arsc_data.extend(bytes(max(0, 4096 - len(arsc_data))))
             
         return bytes(arsc_data)
     
     def _get_default_manifest(self):
         """Get default AndroidManifest.xml content"""
-        return '''<?xml version="1.0" encoding="utf-8"?>
-<manifest xmlns:android="http://schemas.android.com/apk/res/android"
-    package="com.example.modifiedapp"
-    android:versionCode="1"
-    android:versionName="1.0">
-    
-    <uses-sdk
-        android:minSdkVersion="21"
-        android:targetSdkVersion="33" />
-    
-    <application
-        android:allowBackup="true"
-        android:label="Modified App"
-        android:icon="@mipmap/ic_launcher">
-        
-        <activity
-            android:name=".MainActivity"
-            android:exported="true"
-            android:theme="@android:style/Theme.Material">
-            <intent-filter>
-                <action android:name="android.intent.action.MAIN" />
-                <category android:name="android.intent.category.LAUNCHER" />
-            </intent-filter>
-        </activity>
-    </application>
-</manifest>'''
+        return _DEFAULT_MANIFEST
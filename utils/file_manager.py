@@ -2,38 +2,77 @@ import os
 import json
 import logging
 from datetime import datetime
+from utils.linux_statx import entry_size
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 class FileManager:
     def __init__(self, projects_folder):
         self.projects_folder = projects_folder
+        self._metadata_cache = {}
         os.makedirs(projects_folder, exist_ok=True)
 
+    def _load_metadata(self, project_id, metadata_file):
+        """Load metadata.json, reusing the parsed dict while the file is unchanged"""
+        mtime = os.stat(metadata_file).st_mtime_ns
+        cached = self._metadata_cache.get(project_id)
+        if cached is None or cached[0] != mtime:
+            with open(metadata_file, 'rb') as f:
+                raw = f.read()
+            cached = (mtime, orjson.loads(raw) if orjson is not None else json.loads(raw))
+            self._metadata_cache[project_id] = cached
+        # Callers add keys to the result; keep the cached dict pristine
+        return dict(cached[1])
+
+    def _project_stats(self, project_path):
+        """Size and build outputs of a project"""
+        # Always walked: edits under decompiled/ and rewrites of the APKs leave the
+        # project directory's mtime alone, so it cannot key a cached size
+        names = set()
+        size = self._get_directory_size(project_path, names)
+        return {
+            'size': size,
+            # The size walk lists the top level anyway; reuse it for the build outputs
+            'has_compiled': 'compiled.apk' in names,
+            'has_signed': 'signed.apk' in names
+        }
+
     def list_projects(self):
         """List all projects"""
         projects = []
         try:
-            if not os.path.exists(self.projects_folder):
+            try:
+                it = os.scandir(self.projects_folder)
+            except FileNotFoundError:
                 return projects
 
-            for project_dir in os.listdir(self.projects_folder):
-                project_path = os.path.join(self.projects_folder, project_dir)
-                if os.path.isdir(project_path):
-                    metadata_file = os.path.join(project_path, 'metadata.json')
-                    if os.path.exists(metadata_file):
-                        try:
-                            with open(metadata_file, 'r') as f:
-                                metadata = json.load(f)
-                                metadata['id'] = project_dir
-                                projects.append(metadata)
-                        except Exception as e:
-                            logging.error(f"Error reading project metadata: {e}")
-                            # Create basic metadata
-                            projects.append({
-                                'id': project_dir,
-                                'name': project_dir,
-                                'created_at': datetime.now().isoformat(),
-                                'status': 'unknown'
-                            })
+            with it:
+                for entry in it:
+                    # DirEntry.is_dir comes from the directory listing, no extra stat
+                    if not entry.is_dir():
+                        continue
+                    project_dir = entry.name
+                    metadata_file = os.path.join(entry.path, 'metadata.json')
+                    try:
+                        metadata = self._load_metadata(project_dir, metadata_file)
+                        metadata['id'] = project_dir
+                        metadata.update(self._project_stats(entry.path))
+                        projects.append(metadata)
+                    except FileNotFoundError:
+                        # Not a project (no metadata.json) or removed while listing
+                        continue
+                    except Exception as e:
+                        logging.error(f"Error reading project metadata: {e}")
+                        # Create basic metadata
+                        projects.append({
+                            'id': project_dir,
+                            'name': project_dir,
+                            'created_at': datetime.now().isoformat(),
+                            'status': 'unknown'
+                        })
         except Exception as e:
             logging.error(f"Error listing projects: {e}")
 
@@ -45,11 +84,15 @@ class FileManager:
             project_path = os.path.join(self.projects_folder, project_id)
             metadata_file = os.path.join(project_path, 'metadata.json')
 
-            if os.path.exists(metadata_file):
-                with open(metadata_file, 'r') as f:
-                    metadata = json.load(f)
-                    metadata['id'] = project_id
-                    return metadata
+            try:
+                # The stat in _load_metadata doubles as the existence check
+                metadata = self._load_metadata(project_id, metadata_file)
+            except FileNotFoundError:
+                metadata = None
+            if metadata is not None:
+                metadata['id'] = project_id
+                metadata.update(self._project_stats(project_path))
+                return metadata
             elif os.path.exists(project_path):
                 # Create basic metadata if missing
                 metadata = {
@@ -68,10 +111,13 @@ class FileManager:
         """Delete project"""
         try:
             project_path = os.path.join(self.projects_folder, project_id)
-            if os.path.exists(project_path):
-                import shutil
+            self._metadata_cache.pop(project_id, None)
+            import shutil
+            try:
                 shutil.rmtree(project_path)
                 return True
+            except FileNotFoundError:
+                pass
         except Exception as e:
             logging.error(f"Error deleting project {project_id}: {e}")
 
@@ -86,8 +132,7 @@ class FileManager:
             # Load existing metadata or create new
             metadata = {}
             if os.path.exists(metadata_file):
-                with open(metadata_file, 'r') as f:
-                    metadata = json.load(f)
+                metadata = self._load_metadata(project_id, metadata_file)
 
             # Update metadata
             metadata.update(metadata_updates)
@@ -95,8 +140,13 @@ class FileManager:
 
             # Save metadata
             os.makedirs(project_path, exist_ok=True)
-            with open(metadata_file, 'w') as f:
-                json.dump(metadata, f, indent=2)
+            if orjson is not None:
+                with open(metadata_file, 'wb') as f:
+                    f.write(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
+            else:
+                with open(metadata_file, 'w') as f:
+                    json.dump(metadata, f, indent=2)
+            self._metadata_cache.pop(project_id, None)
 
             return True
         except Exception as e:
@@ -104,15 +154,31 @@ class FileManager:
 
         return False
     
-    def _get_directory_size(self, directory):
-        """Calculate directory size"""
+    def _get_directory_size(self, directory, top_level_names=None):
+        """Calculate directory size, optionally collecting the names directly under it"""
         total_size = 0
         try:
-            for dirpath, dirnames, filenames in os.walk(directory):
-                for filename in filenames:
-                    filepath = os.path.join(dirpath, filename)
-                    if os.path.exists(filepath):
-                        total_size += os.path.getsize(filepath)
+            pending = [directory]
+            while pending:
+                path = pending.pop()
+                try:
+                    it = os.scandir(path)
+                except OSError:
+                    # Missing or unreadable directories are skipped, as os.walk does
+                    continue
+                with it:
+                    for entry in it:
+                        if top_level_names is not None and path is directory:
+                            top_level_names.add(entry.name)
+                        if entry.is_dir():
+                            if not entry.is_symlink():
+                                pending.append(entry.path)
+                        else:
+                            try:
+                                total_size += entry_size(entry)
+                            except OSError:
+                                # Dangling symlink or file removed mid-scan
+                                pass
         except Exception as e:
             logging.error(f"Error calculating directory size: {str(e)}")
         
@@ -124,9 +190,7 @@ class FileManager:
             return "0 B"
         
         size_names = ["B", "KB", "MB", "GB"]
-        i = 0
-        while size_bytes >= 1024 and i < len(size_names) - 1:
-            size_bytes /= 1024.0
-            i += 1
+        # Unit straight from the bit length: every 10 bits is one step of 1024
+        i = min(max(0, int(size_bytes).bit_length() - 1) // 10, len(size_names) - 1)
         
-        return f"{size_bytes:.1f} {size_names[i]}"
\ No newline at end of file
+        return f"{size_bytes / (1 << (10 * i)):.1f} {size_names[i]}"
\ No newline at end of file
@@ -0,0 +1,81 @@
+import os
+import sys
+import errno
+import struct
+import ctypes
+import logging
+
+AT_FDCWD = -100
+AT_STATX_DONT_SYNC = 0x4000
+STATX_TYPE = 0x0001
+STATX_SIZE = 0x0200
+
+# struct statx is 256 bytes; stx_mask is the u32 at offset 0, stx_size the u64 at offset 40
+_STATX_BUF_SIZE = 256
+_STX_MASK_OFFSET = 0
+_STX_SIZE_OFFSET = 40
+
+# None = not probed yet, False = unavailable, otherwise the libc statx function
+_statx = None
+
+
+def _get_statx():
+    """Resolve libc statx once; later calls reuse the result"""
+    global _statx
+    if _statx is None:
+        _statx = False
+        if sys.platform.startswith('linux'):
+            try:
+                libc = ctypes.CDLL(None, use_errno=True)
+                func = libc.statx
+                func.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int,
+                                 ctypes.c_uint, ctypes.c_void_p]
+                func.restype = ctypes.c_int
+                _statx = func
+            except (OSError, AttributeError):
+                logging.debug("statx not available, using os.stat")
+    return _statx
+
+
+def _call_statx(path):
+    """Return a filled statx buffer, None if the path is missing, or False if statx is unusable"""
+    global _statx
+    func = _get_statx()
+    if not func:
+        return False
+
+    buf = ctypes.create_string_buffer(_STATX_BUF_SIZE)
+    if func(AT_FDCWD, os.fsencode(path), AT_STATX_DONT_SYNC, STATX_TYPE | STATX_SIZE, buf) == 0:
+        return buf
+
+    err = ctypes.get_errno()
+    if err in (errno.ENOENT, errno.ENOTDIR):
+        return None
+    if err in (errno.ENOSYS, errno.EPERM):
+        # Kernel or seccomp policy rejects statx; stop trying
+        _statx = False
+    return False
+
+
+def fast_size(path):
+    """File size via statx(AT_STATX_DONT_SYNC) on Linux, os.stat elsewhere"""
+    buf = _call_statx(path)
+    if buf is None:
+        raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), path)
+    # The struct is in native byte order; the size is only valid if the kernel filled it
+    if buf is False or not struct.unpack_from('=I', buf, _STX_MASK_OFFSET)[0] & STATX_SIZE:
+        return os.stat(path).st_size
+    return struct.unpack_from('=Q', buf, _STX_SIZE_OFFSET)[0]
+
+
+def fast_exists(path):
+    """Existence check via statx(AT_STATX_DONT_SYNC) on Linux, os.path.exists elsewhere"""
+    buf = _call_statx(path)
+    if buf is False:
+        return os.path.exists(path)
+    return buf is not None
+
+
+def entry_size(entry):
+    """Size of an os.DirEntry without following symlinks; scandir caches the stat"""
+    return entry.stat(follow_symlinks=False).st_size